@@ -0,0 +1,8 @@
+from core.utils.pagination import KeysetPagination
+
+
+class ModerationQueuePagination(KeysetPagination):
+    """Moderation queue, newest first. Backed by comment_status_created_idx."""
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    max_page_size = 200
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from posts.models import Comment
+
+
+class ModerationCommentSerializer(serializers.ModelSerializer):
+    user = serializers.SerializerMethodField()
+    post = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Comment
+        fields = ['id', 'content', 'is_approved', 'created_at', 'user', 'post']
+        
+    def get_user(self, obj):
+        return {'id': obj.user_id, 'username': obj.user.username}
+    
+    def get_post(self, obj):
+        return {'id': obj.post_id, 'title': obj.post.title}
+    
+    
+class BulkCommentActionSerializer(serializers.Serializer):
+    MAX_IDS = 5000
+    
+    action = serializers.ChoiceField(choices=['approve', 'unapprove', 'delete'])
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_IDS,
+    )
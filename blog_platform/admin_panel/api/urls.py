@@ -1,8 +1,10 @@
 from django.urls import path
+from .views import ModerationQueueAPIView, BulkCommentActionAPIView, AuthCacheStatsAPIView
 
 
 urlpatterns = [
-    
+    path('comments/', ModerationQueueAPIView.as_view(), name='moderation_queue'),
+    path('comments/bulk/', BulkCommentActionAPIView.as_view(), name='moderation_bulk_action'),
+    path('auth-cache/', AuthCacheStatsAPIView.as_view(), name='auth_cache_stats'),
 ]
 
-
@@ -0,0 +1,133 @@
+import datetime
+from collections import Counter
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_date
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from core.utils.cache_version import bump_cache_version
+from core.utils.responses import success_response, error_response
+from core.utils.site_stats import adjust_site_stats
+from core.utils.user_cache import get_user_cache
+from posts.models import Comment
+from posts.signals import POSTS_CACHE_VERSION
+from posts.utils.counters import recount_post_counters
+from posts.utils.trending import record_trending_events
+from .pagination import ModerationQueuePagination
+from .serializers import ModerationCommentSerializer, BulkCommentActionSerializer
+
+
+class ModerationQueueAPIView(ListAPIView):
+    """
+    Comments for moderation, newest first, keyset paginated.
+    Filters: status=pending|approved, post=<id>, user=<id>,
+    created_after / created_before (ISO date or datetime).
+    """
+    serializer_class = ModerationCommentSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = ModerationQueuePagination
+    
+    def get_queryset(self):
+        params = self.request.query_params
+        comments = Comment.objects.select_related('user', 'post').only(
+            'id', 'content', 'is_approved', 'created_at',
+            'user__id', 'user__username', 'post__id', 'post__title',
+        )
+        
+        status_filter = params.get('status')
+        if status_filter == 'pending':
+            comments = comments.filter(is_approved=False)
+        elif status_filter == 'approved':
+            comments = comments.filter(is_approved=True)
+            
+        if params.get('post', '').isdigit():
+            comments = comments.filter(post_id=params['post'])
+        if params.get('user', '').isdigit():
+            comments = comments.filter(user_id=params['user'])
+            
+        created_after = self._parse_moment(params, 'created_after')
+        if created_after:
+            comments = comments.filter(created_at__gte=created_after)
+        created_before = self._parse_moment(params, 'created_before')
+        if created_before:
+            comments = comments.filter(created_at__lt=created_before)
+        return comments
+    
+    def _parse_moment(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            moment = parse_datetime(value) or parse_date(value)
+        except ValueError:
+            # Well formed but not a real date, e.g. 2024-13-45.
+            moment = None
+        if moment is None:
+            raise ValidationError({name: 'Enter a valid ISO date or datetime.'})
+        if not isinstance(moment, datetime.datetime):
+            moment = datetime.datetime.combine(moment, datetime.time.min)
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+    
+    
+class BulkCommentActionAPIView(APIView):
+    """
+    Approve, unapprove or delete many comments by id in one transaction.
+    Body: {"action": "approve" | "unapprove" | "delete", "ids": [1, 2, 3]}
+    """
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request):
+        serializer = BulkCommentActionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return error_response(message='Invalid bulk action', error=serializer.errors)
+        action = serializer.validated_data['action']
+        ids = set(serializer.validated_data['ids'])
+        
+        with transaction.atomic():
+            comments = Comment.objects.filter(id__in=ids)
+            if action == 'approve':
+                comments = comments.filter(is_approved=False)
+            elif action == 'unapprove':
+                comments = comments.filter(is_approved=True)
+            # Lock the rows so the per-post counts match what is changed below.
+            rows = list(comments.select_for_update().values_list('id', 'post_id', 'is_approved'))
+            per_post = Counter(post_id for _, post_id, _ in rows)
+            changed = Comment.objects.filter(id__in=[comment_id for comment_id, _, _ in rows])
+            
+            if action == 'approve':
+                affected = changed.update(is_approved=True)
+            elif action == 'unapprove':
+                affected = changed.update(is_approved=False)
+            else:
+                affected = changed.delete()[1].get(Comment._meta.label, 0)
+            # Counters are recounted once per post rather than per comment.
+            recount_post_counters(list(per_post))
+            
+        if action == 'approve':
+            adjust_site_stats(total_comments=affected)
+            record_trending_events((post_id, 'comment', total) for post_id, total in per_post.items())
+        elif action == 'unapprove':
+            adjust_site_stats(total_comments=-affected)
+        else:
+            adjust_site_stats(total_comments=-sum(is_approved for _, _, is_approved in rows))
+        bump_cache_version(POSTS_CACHE_VERSION)
+        
+        return success_response(
+            message=f'{affected} comments updated',
+            data={'action': action, 'requested': len(ids), 'affected': affected},
+            status_code=status.HTTP_200_OK,
+        )
+
+
+class AuthCacheStatsAPIView(APIView):
+    """Hit/miss counters of the authentication user cache, for the worker serving the request."""
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return success_response(data={'user_cache': get_user_cache().stats()})
+
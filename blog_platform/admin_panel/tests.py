@@ -1,3 +1,170 @@
-from django.test import TestCase
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.testing import BlogTestCase, login, make_user
+from core.utils.site_stats import adjust_site_stats, get_site_stats, invalidate_site_stats
+from posts.models import Comment, Post, PostTrendingScore
+from posts.utils.counters import recount_post_counters
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AdminPanelTestCase(BlogTestCase):
+    author_username = 'admin'
+    author_fields = {'is_staff': True, 'is_superuser': True}
+
+    def setUp(self):
+        super().setUp()
+        self.admin = self.author
+
+
+class SiteStatsTests(AdminPanelTestCase):
+    def setUp(self):
+        super().setUp()
+        make_user('writer', is_staff=True)
+        make_user('reader')
+        self.make_post('Live', view_count=7, like_count=2)
+        self.make_post('Draft', is_draft=True, view_count=3)
+
+    def test_reconciles_from_the_database_then_serves_the_snapshot(self):
+        stats = get_site_stats()
+        self.assertEqual(stats['total_posts'], 1)
+        self.assertEqual(stats['total_readers'], 1)
+        self.assertEqual(stats['total_writers'], 2)
+        self.assertEqual(stats['total_views'], 10)
+        self.assertEqual(stats['total_likes'], 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_site_stats(), stats)
+
+    def test_adjust_updates_the_cached_snapshot(self):
+        get_site_stats()
+        adjust_site_stats(total_views=5, total_likes=0, total_readers=-1)
+        stats = get_site_stats()
+        self.assertEqual(stats['total_views'], 15)
+        self.assertEqual(stats['total_likes'], 2)
+        self.assertEqual(stats['total_readers'], 0)
+
+    def test_adjust_without_a_snapshot_is_ignored_until_rebuilt(self):
+        adjust_site_stats(total_views=100)
+        self.assertEqual(get_site_stats()['total_views'], 10)
+
+    def test_invalidate_forces_a_recount(self):
+        get_site_stats()
+        Post.objects.update(view_count=0)
+        self.assertEqual(get_site_stats()['total_views'], 10)
+        invalidate_site_stats()
+        self.assertEqual(get_site_stats()['total_views'], 0)
+
+    def test_registration_counts_a_new_reader(self):
+        get_site_stats()
+        response = self.client.post('/api/users/register/', {
+            'email': 'newbie@example.com', 'username': 'newbie',
+            'password': 'Secret@pass123', 'confirm_password': 'Secret@pass123',
+        })
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(get_site_stats()['total_readers'], 2)
+
+    def test_dashboard_renders_the_stats(self):
+        login(self.client, self.admin)
+        response = self.client.get('/admin-panel/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['site_stats']['total_views'], 10)
+
+    def test_dashboard_redirects_non_superusers(self):
+        login(self.client, User.objects.get(username='reader'))
+        response = self.client.get('/admin-panel/dashboard/')
+        self.assertEqual(response.status_code, 302)
+
+
+class ModerationQueueTests(AdminPanelTestCase):
+    url = '/api/admin-panel/comments/'
+
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.reader = make_user('reader')
+        self.pending = Comment.objects.create(post=self.post, user=self.reader, content='Pending')
+        self.approved = Comment.objects.create(post=self.post, user=self.admin, content='Approved', is_approved=True)
+        Comment.objects.filter(pk=self.approved.pk).update(created_at=self.approved.created_at - timedelta(days=10))
+        login(self.client, self.admin)
+
+    def _ids(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [comment['id'] for comment in response.json()['data']['results']]
+
+    def test_filters_by_status_author_and_date(self):
+        self.assertEqual(self._ids(), [self.pending.id, self.approved.id])
+        self.assertEqual(self._ids(status='pending'), [self.pending.id])
+        self.assertEqual(self._ids(status='approved'), [self.approved.id])
+        self.assertEqual(self._ids(user=self.reader.id), [self.pending.id])
+        self.assertEqual(self._ids(post=self.post.id, created_before=timezone.now().date().isoformat()), [self.approved.id])
+        self.assertEqual(self._ids(created_after=(timezone.now() - timedelta(days=1)).isoformat()), [self.pending.id])
+
+    def test_invalid_dates_are_rejected(self):
+        for value in ('yesterday', '2024-13-45'):
+            with self.subTest(value=value):
+                response = self.client.get(self.url, {'created_after': value})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('created_after', response.content.decode())
+
+    def test_is_admin_only(self):
+        login(self.client, self.reader)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class BulkCommentActionTests(AdminPanelTestCase):
+    url = '/api/admin-panel/comments/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.reader = make_user('reader')
+        self.comments = [Comment.objects.create(post=self.post, user=self.reader, content=f'C{i}') for i in range(3)]
+        self.ids = [comment.id for comment in self.comments]
+        login(self.client, self.admin)
+
+    def _post(self, action, ids):
+        return self.client.post(self.url, {'action': action, 'ids': ids}, content_type='application/json')
+
+    def _counts(self):
+        post = Post.objects.get(pk=self.post.pk)
+        return post.comment_count, post.approved_comment_count
+
+    def test_approve_and_unapprove_update_counters(self):
+        response = self._post('approve', self.ids + [999999])
+        self.assertEqual(response.json()['data'], {'action': 'approve', 'requested': 4, 'affected': 3})
+        self.assertEqual(self._counts(), (3, 3))
+        self.assertTrue(PostTrendingScore.objects.filter(pk=self.post.pk).exists())
+
+        self.assertEqual(self._post('approve', self.ids).json()['data']['affected'], 0)
+        self.assertEqual(self._post('unapprove', self.ids[:1]).json()['data']['affected'], 1)
+        self.assertEqual(self._counts(), (3, 2))
+
+    def test_delete_locks_the_rows_and_recounts_once(self):
+        Comment.objects.filter(pk=self.ids[0]).update(is_approved=True)
+        recount_post_counters([self.post.id])
+        get_site_stats()
+        with CaptureQueriesContext(connection) as queries:
+            response = self._post('delete', self.ids[:2])
+        self.assertEqual(response.json()['data']['affected'], 2)
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 1)
+        if connection.features.has_select_for_update:
+            self.assertTrue(any('FOR UPDATE' in query['sql'] for query in queries))
+        self.assertEqual(list(Comment.objects.values_list('id', flat=True)), self.ids[2:])
+        self.assertEqual(self._counts(), (1, 0))
+        self.assertEqual(get_site_stats()['total_comments'], 0)
+
+    def test_invalid_requests_are_rejected(self):
+        for action, ids in (('archive', self.ids), ('approve', []), ('approve', ['x'])):
+            with self.subTest(action=action, ids=ids):
+                self.assertEqual(self._post(action, ids).status_code, 400)
+        self.assertFalse(Comment.objects.filter(is_approved=True).exists())
+
+    def test_is_admin_only(self):
+        login(self.client, self.reader)
+        self.assertEqual(self._post('delete', self.ids).status_code, 403)
+        self.assertEqual(Comment.objects.count(), 3)
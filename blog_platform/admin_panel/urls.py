@@ -3,7 +3,7 @@ from . import views
 from .views import DashboardView, UsersListView, UserCreateView, UserEditView, PostListView, AdminPostDetailView, AdminCommentView
 
 urlpatterns = [
-    # path('', DashboardView.as_view(), name='admin_dashboard'),
+    path('dashboard/', DashboardView.as_view(), name='admin_dashboard'),
     path('', UsersListView.as_view(), name='admin_users_list'),
     path('user-create/', UserCreateView.as_view(), name='admin_user_create'),
     path('user-edit/<int:user_id>/', UserEditView.as_view(), name='admin_user_edit'),
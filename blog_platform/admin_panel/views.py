@@ -5,12 +5,19 @@ from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
 from posts.models import Post, PostReaction, Comment
 from django.views import View
+from django.core.paginator import Paginator
+from core.utils.site_stats import get_site_stats
 
 
 @method_decorator(never_cache, name='dispatch')
 class DashboardView(SuperUserRequiredMixin, ActiveSectionMixin, TemplateView):
     template_name = 'admin_panel/dashboard.html'
     active_section = 'admin_dashboard'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['site_stats'] = get_site_stats()
+        return context
   
 @method_decorator(never_cache, name='dispatch')
 class UsersListView(SuperUserRequiredMixin, ActiveSectionMixin, TemplateView):
@@ -42,11 +49,9 @@ class AdminPostDetailView(SuperUserRequiredMixin,TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         post_id = self.kwargs.get('post_id')  
-        post_data = Post.objects.get(id=post_id)
-        user_id = self.request.user.id
-        is_liked = post_data.reactions.filter(user_id = user_id).exists()
+        post_data = Post.objects.with_related().with_is_liked(self.request.user).get(id=post_id)
         context['post'] = post_data
-        context['is_liked'] = is_liked
+        context['is_liked'] = post_data.is_liked
         return context 
            
 @method_decorator(never_cache, name='dispatch')
@@ -54,8 +59,14 @@ class AdminCommentView(SuperUserRequiredMixin, ActiveSectionMixin, View):
         template_name = 'admin_panel/admin_comments_list.html'
         active_section = 'admin_comments' 
         
+        paginate_by = 50
+        
         def get(self, request):
-            comments = Comment.objects.all()
+            comments = Comment.objects.select_related('user', 'post').only(
+                'id', 'content', 'is_approved', 'created_at',
+                'user__id', 'user__username', 'post__id', 'post__title',
+            ).order_by('-created_at', '-id')
+            comments = Paginator(comments, self.paginate_by).get_page(request.GET.get('page'))
             context = {
                 'comments': comments,
                 'active_section': self.active_section
@@ -179,7 +179,7 @@ AUTHENTICATION_BACKENDS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.RequestContextJWTAuthentication',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -202,6 +202,102 @@ SIMPLE_JWT = {
     'AUTH_COOKIE_SAMESITE': 'Lax',
 }
 
+# Use a shared backend (e.g. Redis) in production so cache invalidation
+# reaches every worker; the default is per-process memory.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Upper bound on staleness of cached home page fragments (seconds). They are
+# also invalidated whenever posts, comments or likes change.
+HOME_FRAGMENT_CACHE_TIMEOUT = config('HOME_FRAGMENT_CACHE_TIMEOUT', default=60, cast=int)
+
+# Cached site statistics (core.utils.site_stats) are rebuilt from the
+# database at this interval (seconds) to correct drift.
+SITE_STATS_RECONCILE_INTERVAL = config('SITE_STATS_RECONCILE_INTERVAL', default=15 * 60, cast=int)
+
+# Write-behind buffer for post view ingestion (posts.utils.view_buffer).
+# Use posts.utils.view_buffer.CacheViewBufferBackend to share one buffer
+# between workers through a cache alias.
+POST_VIEW_BUFFER = {
+    'BACKEND': 'posts.utils.view_buffer.LocalViewBufferBackend',
+    'OPTIONS': {},
+    'FLUSH_INTERVAL': config('POST_VIEW_FLUSH_INTERVAL', default=5, cast=float),
+    'FLUSH_SIZE': config('POST_VIEW_FLUSH_SIZE', default=500, cast=int),
+}
+
+# Repeat views of a post by the same viewer inside this window (seconds)
+# are acknowledged but not recorded. 0 disables de-duplication.
+POST_VIEW_DEDUPE_WINDOW = config('POST_VIEW_DEDUPE_WINDOW', default=30 * 60, cast=int)
+POST_VIEW_DEDUPE_MAX_ENTRIES = 100_000
+
+# Raw PostView rows older than this are moved to archive files by
+# `manage.py archive_post_views`.
+POST_VIEW_RETENTION_DAYS = config('POST_VIEW_RETENTION_DAYS', default=90, cast=int)
+
+# Trending ranking (posts.utils.trending): engagement weights and how fast
+# they decay.
+TRENDING = {
+    'HALF_LIFE_HOURS': config('TRENDING_HALF_LIFE_HOURS', default=24, cast=float),
+    'WEIGHTS': {'view': 1.0, 'like': 3.0, 'comment': 5.0},
+}
+
+# Chunked, resumable attachment uploads (posts.utils.chunked_upload).
+# Chunks are staged on local disk until the upload completes; with several
+# app servers STAGING_DIR must be on a shared volume.
+ATTACHMENT_UPLOADS = {
+    'STAGING_DIR': config('ATTACHMENT_UPLOAD_STAGING_DIR', default=str(BASE_DIR / 'upload_staging')),
+    'CHUNK_SIZE': config('ATTACHMENT_UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int),
+    'MAX_SIZE': config('ATTACHMENT_UPLOAD_MAX_SIZE', default=500 * 1024 * 1024, cast=int),
+    'EXPIRY_HOURS': config('ATTACHMENT_UPLOAD_EXPIRY_HOURS', default=24, cast=int),
+}
+
+# Attachment downloads through /api/posts/<id>/attachment/ (posts.utils.downloads).
+# With REDIRECT_TO_STORAGE, files of at least REDIRECT_MIN_SIZE bytes are
+# served by redirecting to a presigned S3 URL instead of being streamed.
+ATTACHMENT_DOWNLOADS = {
+    'CHUNK_SIZE': 256 * 1024,
+    'REDIRECT_TO_STORAGE': config('ATTACHMENT_DOWNLOAD_REDIRECT', default=False, cast=bool),
+    'REDIRECT_MIN_SIZE': config('ATTACHMENT_DOWNLOAD_REDIRECT_MIN_SIZE', default=0, cast=int),
+    'PRESIGNED_URL_EXPIRY': 5 * 60,
+}
+
+# Per-process cache of users for request authentication (core.utils.user_cache).
+# Entries are invalidated through CACHES on every user save, so the shared
+# cache backend must be used when running several workers. TTL 0 disables it.
+USER_CACHE = {
+    'TTL': config('USER_CACHE_TTL', default=5 * 60, cast=int),
+    'MAX_ENTRIES': config('USER_CACHE_MAX_ENTRIES', default=10_000, cast=int),
+}
+
+# Access tokens whose signature was already verified are remembered (by
+# digest) until they expire, see core.utils.token_cache. 0 disables it.
+VERIFIED_TOKEN_CACHE_SIZE = config('VERIFIED_TOKEN_CACHE_SIZE', default=10_000, cast=int)
+
+# Revoked JWTs (logout, refresh rotation), see core.utils.token_revocation.
+# Other workers see a revocation within SYNC_INTERVAL seconds.
+TOKEN_REVOCATION = {
+    'SYNC_INTERVAL': config('TOKEN_REVOCATION_SYNC_INTERVAL', default=5, cast=float),
+    'REBUILD_INTERVAL': 60 * 60,
+    'FALSE_POSITIVE_RATE': 0.001,
+    'INITIAL_CAPACITY': 10_000,
+}
+
+# Concurrent refreshes of the same refresh token share one rotation, and
+# requests arriving within GRACE_PERIOD seconds get the same new tokens
+# (core.utils.refresh_coalescer). With several workers use
+# core.utils.refresh_coalescer.CacheRefreshBackend on a shared cache.
+# GRACE_PERIOD 0 disables coalescing.
+TOKEN_REFRESH_COALESCING = {
+    'BACKEND': 'core.utils.refresh_coalescer.LocalRefreshBackend',
+    'OPTIONS': {},
+    'GRACE_PERIOD': config('TOKEN_REFRESH_GRACE_PERIOD', default=30, cast=float),
+    'WAIT_TIMEOUT': 10,
+}
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
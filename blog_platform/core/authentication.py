@@ -0,0 +1,53 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .utils.auth_context import get_auth_context
+from .utils.token_revocation import get_revocation_store
+
+
+class RequestContextJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that reuses the claims and user already resolved for
+    this request (core.utils.auth_context) instead of verifying the token
+    and loading the user a second time. Tokens that did not come through
+    JWTRefreshMiddleware take the regular path.
+    """
+    
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        
+        context = get_auth_context(request._request)
+        token_class = self._context_token_class(context, raw_token)
+        if token_class is None:
+            return super().authenticate(request)
+        
+        # Already verified by the middleware, only parse it.
+        validated_token = token_class(raw_token, verify=False)
+        user = context.user
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user, validated_token
+    
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if get_revocation_store().is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_("Token has been revoked"))
+        return validated_token
+    
+    def _context_token_class(self, context, raw_token):
+        if not context.is_authenticated or context.token != raw_token.decode() or api_settings.CHECK_REVOKE_TOKEN:
+            return None
+        token_type = context.payload.get(api_settings.TOKEN_TYPE_CLAIM)
+        for token_class in api_settings.AUTH_TOKEN_CLASSES:
+            if token_class.token_type == token_type:
+                return token_class
+        return None
@@ -1,12 +1,9 @@
-from .utils.jwt_helper import JWTHelper
+from .utils.auth_context import get_auth_context
 
 def jwt_user_context(request):
-    access_token = request.COOKIES.get('access_token')
-    user = None
-    if access_token and JWTHelper.is_token_valid(access_token):
-        user = JWTHelper.get_user_from_token(access_token)
+    user = get_auth_context(request).user
        
     return {
         'user_is_authenticated': user is not None,
         'current_user': user
-    }    
\ No newline at end of file
+    }
@@ -2,7 +2,11 @@ from django.utils.deprecation import MiddlewareMixin
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.utils.functional import SimpleLazyObject
 from ..utils.jwt_helper import JWTHelper
+from ..utils.auth_context import ANONYMOUS, AuthContext, build_auth_context
+from ..utils.refresh_coalescer import get_refresh_coalescer
 
 User = get_user_model()
 
@@ -15,25 +19,21 @@ class JWTRefreshMiddleware(MiddlewareMixin):
         
         access_token = request.COOKIES.get('access_token')
         refresh_token = request.COOKIES.get('refresh_token')
+        request.auth_context = ANONYMOUS
         
         if not access_token and not refresh_token:
             return None
         
-        if access_token and JWTHelper.is_token_valid(access_token):
-            request.META['HTTP_AUTHORIZATION'] = f'Bearer {access_token}'
-            user = JWTHelper.get_user_from_token(access_token)
-            if user:
-                request.user = user
+        context = build_auth_context(access_token)
+        if context.is_authenticated:
+            self._authenticate(request, context)
             return None
             
         if refresh_token:
-            new_tokens = JWTHelper.refresh_tokens(refresh_token)
+            # Parallel requests with the same expired session share one rotation.
+            new_tokens = get_refresh_coalescer().refresh(refresh_token)
             if new_tokens:
-                request.META['HTTP_AUTHORIZATION'] = f'Bearer {new_tokens["access"]}'
-                user = JWTHelper.get_user_from_token(new_tokens['access'])
-                if user:
-                    request.user = user
-
+                self._authenticate(request, AuthContext(new_tokens['access'], new_tokens['access_payload']))
                 request._new_access_token = new_tokens['access']
                 request._new_refresh_token = new_tokens['refresh']
                 return None
@@ -43,6 +43,12 @@ class JWTRefreshMiddleware(MiddlewareMixin):
         
         return None
     
+    def _authenticate(self, request, context):
+        request.auth_context = context
+        request.META['HTTP_AUTHORIZATION'] = f'Bearer {context.token}'
+        # Loaded on first use, so requests that never look at the user skip the query.
+        request.user = SimpleLazyObject(lambda: context.user or AnonymousUser())
+    
     def process_response(self, request, response):
         if hasattr(request, '_new_access_token') and hasattr(request, '_new_refresh_token'):
             JWTHelper.set_auth_cookies(
@@ -0,0 +1,75 @@
+"""
+Helpers shared by the apps' tests.py modules.
+"""
+import shutil
+import tempfile
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from posts.models import Category, Post
+from .utils import refresh_coalescer, token_revocation
+from .utils.jwt_helper import JWTHelper
+from .utils.token_cache import get_token_cache
+from .utils.user_cache import get_user_cache
+
+User = get_user_model()
+
+
+def make_user(username, **extra):
+    return User.objects.create_user(
+        email=f'{username}@example.com', username=username, password='secret-pass-123', **extra
+    )
+
+
+def login(client, user):
+    """Authenticate the test client the way the browser does, with JWT cookies."""
+    refresh = JWTHelper.get_tokens_for_user(user)
+    client.cookies['access_token'] = str(refresh.access_token)
+    client.cookies['refresh_token'] = str(refresh)
+
+
+class IsolatedTestCase(TestCase):
+    """
+    Per-process caches and singletons outlive the rolled back test
+    transaction; start every test without them.
+    """
+
+    def setUp(self):
+        cache.clear()
+        get_user_cache().clear()
+        get_token_cache().clear()
+        for module, name in ((token_revocation, '_store'), (refresh_coalescer, '_coalescer')):
+            self.addCleanup(setattr, module, name, None)
+            setattr(module, name, None)
+
+
+class BlogTestCase(IsolatedTestCase):
+    """A category and a staff author to create posts with."""
+    author_username = 'author'
+    author_fields = {'is_staff': True}
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='Tech', description='Tech posts')
+        self.author = make_user(self.author_username, **self.author_fields)
+
+    def make_post(self, title='Post', **fields):
+        fields.setdefault('content', '<p>Body</p>')
+        return Post.objects.create(author=self.author, category=self.category, title=title, **fields)
+
+
+class TempStorageMixin:
+    """Point the default storage (S3 in settings) at a throwaway directory."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.enterContext(override_settings(STORAGES={
+            **settings.STORAGES,
+            'default': {
+                'BACKEND': 'django.core.files.storage.FileSystemStorage',
+                'OPTIONS': {'location': self.media_root},
+            },
+        }))
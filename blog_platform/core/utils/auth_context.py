@@ -0,0 +1,51 @@
+"""
+Per-request authentication state.
+
+JWTRefreshMiddleware verifies the access token (or mints a new one from the
+refresh token) once and stores the result on `request.auth_context`. The
+context processor, view mixins and DRF authentication read it from there
+instead of decoding the cookie again, and the user row is loaded at most
+once, on first access.
+"""
+from functools import cached_property
+from .jwt_helper import JWTHelper
+
+
+class AuthContext:
+    def __init__(self, token=None, payload=None):
+        self.token = token
+        self.payload = payload
+        
+    @property
+    def is_authenticated(self):
+        return self.payload is not None
+    
+    @cached_property
+    def user(self):
+        if self.payload is None:
+            return None
+        return JWTHelper.get_user_from_payload(self.payload)
+    
+    
+ANONYMOUS = AuthContext()
+
+
+def build_auth_context(access_token):
+    if not access_token:
+        return ANONYMOUS
+    payload = JWTHelper.verify_token(access_token)
+    if payload is None:
+        return ANONYMOUS
+    return AuthContext(access_token, payload)
+
+
+def get_auth_context(request):
+    """
+    The request's AuthContext. Normally set by JWTRefreshMiddleware; built
+    from the access cookie for requests the middleware skipped.
+    """
+    context = getattr(request, 'auth_context', None)
+    if context is None:
+        context = build_auth_context(request.COOKIES.get('access_token'))
+        request.auth_context = context
+    return context
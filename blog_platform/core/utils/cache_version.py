@@ -0,0 +1,34 @@
+import time
+from django.core.cache import cache
+
+
+def _key(name):
+    return f'cache_version:{name}'
+
+
+def _seed():
+    # A version key that was evicted must not come back with a number an
+    # entry cached before the eviction still carries. Bumps count up by one,
+    # so a clock in microseconds stays ahead of every earlier version.
+    return time.time_ns() // 1000
+
+
+def get_cache_version(name):
+    """
+    Current version number for a named group of cached content. Embed it in
+    cache keys so that bumping the version invalidates every entry at once.
+    """
+    version = cache.get(_key(name))
+    if version is None:
+        seed = _seed()
+        cache.add(_key(name), seed, timeout=None)
+        version = cache.get(_key(name), seed)
+    return version
+
+
+def bump_cache_version(name):
+    try:
+        return cache.incr(_key(name))
+    except ValueError:
+        cache.add(_key(name), _seed(), timeout=None)
+        return cache.incr(_key(name))
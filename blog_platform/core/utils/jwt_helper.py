@@ -5,6 +5,10 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
 from rest_framework_simplejwt.state import token_backend
+from rest_framework_simplejwt.settings import api_settings
+from .user_cache import get_user_cache
+from .token_cache import get_token_cache
+from .token_revocation import get_revocation_store
 
 User = get_user_model()
 
@@ -30,33 +34,86 @@ class JWTHelper:
         return datetime.datetime.now(datetime.timezone.utc) > exp 
     
     @staticmethod
-    def is_token_valid(token):
+    def verify_token(token):
+        """
+        Verify signature and expiry; returns the claims or None. Tokens seen
+        before are answered from the verified-token cache without any crypto.
+        """
+        token_cache = get_token_cache()
+        payload = token_cache.get(token)
+        if payload is None:
+            try:
+                payload = UntypedToken(token).payload
+            except (TokenError, InvalidToken):
+                return None
+            token_cache.put(token, payload)
+        if get_revocation_store().is_revoked(payload.get(api_settings.JTI_CLAIM)):
+            return None
+        return payload
+    
+    @staticmethod
+    def revoke_token(token):
+        """Revoke a still-valid token so it is refused until it expires. Invalid tokens are ignored."""
         try:
-            UntypedToken(token)
-            return True
+            payload = UntypedToken(token).payload
         except (TokenError, InvalidToken):
-            return False
+            return
+        get_revocation_store().revoke(payload.get(api_settings.JTI_CLAIM), payload['exp'])
     
     @staticmethod
-    def get_user_from_token(token):
-        """Extract user from access token"""
+    def is_token_valid(token):
+        return JWTHelper.verify_token(token) is not None
+    
+    @staticmethod
+    def _load_user(user_id):
         try:
-            payload = JWTHelper._decode_token(token)
-            if payload and 'user_id' in payload:
-                return User.objects.get(id=payload['user_id'])
-        except User.DoesNotExist:
+            return User.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except (User.DoesNotExist, ValueError):
             return None
-        except Exception:
+    
+    @staticmethod
+    def get_user_from_payload(payload):
+        """User named by the token claims, served from the user cache when warm."""
+        user_id = payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return None
+        return get_user_cache().get(user_id, JWTHelper._load_user)
+    
+    @staticmethod
+    def get_user_from_token(token):
+        """Extract user from access token"""
+        payload = JWTHelper.verify_token(token)
+        if payload is None:
             return None
+        return JWTHelper.get_user_from_payload(payload)
     
     @staticmethod
     def refresh_tokens(refresh_token):
+        """
+        New token pair for a refresh token, or None if it is invalid or
+        revoked. With ROTATE_REFRESH_TOKENS the refresh token gets a new jti
+        and expiry, and with BLACKLIST_AFTER_ROTATION the old one is revoked.
+        'access_payload' holds the claims of the new access token, which is
+        trusted without decoding it again.
+        """
         try:
             refresh = RefreshToken(refresh_token)
-            new_refresh = str(refresh) if settings.SIMPLE_JWT.get('ROTATE_REFRESH_TOKENS', False) else refresh_token
+            revocations = get_revocation_store()
+            if revocations.is_revoked(refresh.get(api_settings.JTI_CLAIM)):
+                return None
+            access = refresh.access_token
+            new_refresh = refresh_token
+            if settings.SIMPLE_JWT.get('ROTATE_REFRESH_TOKENS', False):
+                if settings.SIMPLE_JWT.get('BLACKLIST_AFTER_ROTATION', False):
+                    revocations.revoke(refresh.get(api_settings.JTI_CLAIM), refresh['exp'])
+                refresh.set_jti()
+                refresh.set_exp()
+                refresh.set_iat()
+                new_refresh = str(refresh)
             return {
-                'access': str(refresh.access_token),
-                'refresh': new_refresh
+                'access': str(access),
+                'refresh': new_refresh,
+                'access_payload': access.payload,
             } 
         except (TokenError, InvalidToken):
             return None          
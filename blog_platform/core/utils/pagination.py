@@ -0,0 +1,138 @@
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.pagination import BasePagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from .responses import success_response
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    Instead of OFFSET or COUNT(*), each page is fetched with a
+    `WHERE (a, b) < (x, y) ORDER BY a, b LIMIT n + 1` style query that can
+    be served straight from a composite index on the ordering columns.
+    The opaque cursor carries the boundary row's ordering values and the
+    direction, so clients can page forward and backward.
+    """
+    ordering = ('-id',)
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(self.cursor and self.cursor['reverse'])
+
+        queryset = queryset.order_by(*self._ordering(reverse))
+        if self.cursor:
+            queryset = queryset.filter(self._seek_filter(self.cursor['position'], reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+
+        self.page = rows
+        return rows
+
+    def get_paginated_data(self, data):
+        return {
+            'results': data,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+            'page_size': self.page_size,
+        }
+
+    def get_paginated_response(self, data):
+        return success_response(data=self.get_paginated_data(data))
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def decode_cursor(self, request, model=None):
+        """
+        Cursor from the query string, or None on the first page. With `model`
+        each position value is converted to its ordering field's type, so a
+        tampered cursor is rejected here instead of failing in the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError
+            if model is not None:
+                position = [self._to_python(model, field, value) for field, value in zip(self._fields(), position)]
+            return {'position': position, 'reverse': bool(payload.get('r'))}
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+
+    def _link(self, row, reverse):
+        position = []
+        for field in self._fields():
+            value = getattr(row, field)
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    @staticmethod
+    def _to_python(model, field, value):
+        if value is None or isinstance(value, (list, dict, bool)):
+            raise ValueError
+        return model._meta.get_field(field).to_python(value)
+
+    def _fields(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+
+    def _seek_filter(self, position, reverse):
+        """Lexicographic "comes after the cursor" filter for the ordering."""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self._ordering(reverse), position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
@@ -0,0 +1,179 @@
+"""
+Single-flight refresh token rotation.
+
+When an access token expires, a page usually fires several requests at
+once, all carrying the same refresh token. Rotating it once per request
+would mint several token pairs, revoke the token mid-flight and leave the
+browser with whichever cookies arrive last. Instead the first request
+refreshes (the leader) and the others wait for its result. The result is
+kept for GRACE_PERIOD seconds, so stragglers still holding the old refresh
+token receive the same new pair instead of being logged out, unless the
+pair has been revoked (by a logout) in the meantime.
+
+The default backend coordinates requests within one process. With several
+workers, CacheRefreshBackend shares the flights through a cache alias
+(e.g. Redis). Results contain the new tokens and are stored under a digest
+of the old refresh token, so that cache must not be reachable by clients.
+"""
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .jwt_helper import JWTHelper
+from .token_revocation import get_revocation_store
+
+DEFAULTS = {
+    'BACKEND': 'core.utils.refresh_coalescer.LocalRefreshBackend',
+    'OPTIONS': {},
+    'GRACE_PERIOD': 30,
+    'WAIT_TIMEOUT': 10,
+}
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.found = False
+        self.result = None
+        self.expires_at = None
+
+
+class LocalRefreshBackend:
+    """Coalesces refreshes between the threads of one process."""
+    
+    def __init__(self, **options):
+        self._flights = {}
+        self._lock = threading.Lock()
+    
+    def claim(self, key, timeout):
+        """Whether the caller should perform the refresh for `key`."""
+        now = time.monotonic()
+        with self._lock:
+            for stale in [k for k, flight in self._flights.items() if flight.expires_at is not None and flight.expires_at <= now]:
+                del self._flights[stale]
+            if key in self._flights:
+                return False
+            self._flights[key] = _Flight()
+            return True
+    
+    def publish(self, key, result, grace_period):
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                return
+            flight.found, flight.result = True, result
+            flight.expires_at = time.monotonic() + grace_period
+        flight.done.set()
+    
+    def release(self, key):
+        """Give up a claim without a result; waiters fall back to refreshing themselves."""
+        with self._lock:
+            flight = self._flights.pop(key, None)
+        if flight is not None:
+            flight.done.set()
+    
+    def wait(self, key, timeout):
+        """(found, result) of the flight for `key`."""
+        with self._lock:
+            flight = self._flights.get(key)
+        if flight is None or not flight.done.wait(timeout):
+            return False, None
+        return flight.found, flight.result
+
+
+class CacheRefreshBackend:
+    """
+    Coalesces refreshes between workers through a Django cache alias.
+    Claims rely on atomic `add`; waiters poll for the result.
+    """
+    
+    def __init__(self, alias='default', prefix='token_refresh', poll_interval=0.05, **options):
+        self.cache = caches[alias]
+        self.prefix = prefix
+        self.poll_interval = poll_interval
+    
+    def _key(self, kind, key):
+        return f'{self.prefix}:{kind}:{key}'
+    
+    def claim(self, key, timeout):
+        return self.cache.add(self._key('lock', key), 1, timeout=timeout)
+    
+    def publish(self, key, result, grace_period):
+        # Wrapped so a failed refresh (None) is distinguishable from a missing entry.
+        self.cache.set(self._key('result', key), {'result': result}, timeout=grace_period)
+        # Hold the claim as long as the result, so late requests wait instead of refreshing again.
+        self.cache.set(self._key('lock', key), 1, timeout=grace_period)
+    
+    def release(self, key):
+        self.cache.delete(self._key('lock', key))
+    
+    def wait(self, key, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.cache.get(self._key('result', key))
+            if entry is not None:
+                return True, entry['result']
+            if time.monotonic() >= deadline or self.cache.get(self._key('lock', key)) is None:
+                return False, None
+            time.sleep(self.poll_interval)
+
+
+def _is_revoked(result):
+    """Whether either token of a published pair has been revoked since it was minted."""
+    revocations = get_revocation_store()
+    if revocations.is_revoked(result['access_payload'].get(api_settings.JTI_CLAIM)):
+        return True
+    try:
+        # Minted and signed by this server moments ago, so only the claims are read.
+        refresh = RefreshToken(result['refresh'], verify=False)
+    except TokenError:
+        return True
+    return revocations.is_revoked(refresh.get(api_settings.JTI_CLAIM))
+
+
+class RefreshCoalescer:
+    def __init__(self, backend, grace_period, wait_timeout):
+        self.backend = backend
+        self.grace_period = grace_period
+        self.wait_timeout = wait_timeout
+    
+    def refresh(self, refresh_token):
+        """Same contract as JWTHelper.refresh_tokens, shared by concurrent callers."""
+        if not self.grace_period:
+            return JWTHelper.refresh_tokens(refresh_token)
+        key = hashlib.sha256(refresh_token.encode()).hexdigest()
+        if self.backend.claim(key, self.wait_timeout):
+            try:
+                result = JWTHelper.refresh_tokens(refresh_token)
+            except Exception:
+                self.backend.release(key)
+                raise
+            self.backend.publish(key, result, self.grace_period)
+            return result
+        found, result = self.backend.wait(key, self.wait_timeout)
+        if found:
+            if result is not None and _is_revoked(result):
+                return None
+            return result
+        # The leader failed or timed out.
+        return JWTHelper.refresh_tokens(refresh_token)
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_refresh_coalescer():
+    global _coalescer
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                config = {**DEFAULTS, **getattr(settings, 'TOKEN_REFRESH_COALESCING', {})}
+                backend = import_string(config['BACKEND'])(**config['OPTIONS'])
+                _coalescer = RefreshCoalescer(backend, config['GRACE_PERIOD'], config['WAIT_TIMEOUT'])
+    return _coalescer
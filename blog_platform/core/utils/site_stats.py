@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+STAT_NAMES = (
+    'total_posts',
+    'total_readers',
+    'total_writers',
+    'total_views',
+    'total_likes',
+    'total_comments',
+)
+KEY_PREFIX = 'site_stats:'
+
+READER_FILTER = Q(is_superuser=False, is_staff=False)
+WRITER_FILTER = Q(is_superuser=True) | Q(is_staff=True)
+
+
+def get_site_stats():
+    """
+    Site-wide totals from the cached snapshot. The snapshot is adjusted in
+    place by write paths and recomputed from the database whenever it
+    expires (every SITE_STATS_RECONCILE_INTERVAL seconds), which corrects
+    any drift from writes that bypassed adjust_site_stats().
+    """
+    stats = cache.get_many([KEY_PREFIX + name for name in STAT_NAMES])
+    if len(stats) != len(STAT_NAMES):
+        return reconcile_site_stats()
+    return {name: stats[KEY_PREFIX + name] for name in STAT_NAMES}
+
+
+def reconcile_site_stats():
+    from posts.models import Post
+    
+    User = get_user_model()
+    stats = Post.objects.aggregate(
+        total_posts=Count('id', filter=Q(is_draft=False)),
+        total_views=Sum('view_count'),
+        total_likes=Sum('like_count'),
+        total_comments=Sum('approved_comment_count'),
+    )
+    stats.update(User.objects.aggregate(
+        total_readers=Count('id', filter=READER_FILTER),
+        total_writers=Count('id', filter=WRITER_FILTER),
+    ))
+    stats = {name: stats[name] or 0 for name in STAT_NAMES}
+    cache.set_many(
+        {KEY_PREFIX + name: value for name, value in stats.items()},
+        timeout=settings.SITE_STATS_RECONCILE_INTERVAL,
+    )
+    return stats
+
+
+def invalidate_site_stats():
+    """Drop the snapshot after changes that are easier to recount than to track."""
+    cache.delete_many([KEY_PREFIX + name for name in STAT_NAMES])
+
+
+def adjust_site_stats(**deltas):
+    """Apply increments such as adjust_site_stats(total_likes=1) to the snapshot."""
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(KEY_PREFIX + name, delta)
+        except ValueError:
+            # Not cached yet: the next read rebuilds the whole snapshot.
+            pass
+        
+        
+def user_stat_name(user):
+    return 'total_writers' if user.is_superuser or user.is_staff else 'total_readers'
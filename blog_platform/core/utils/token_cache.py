@@ -0,0 +1,84 @@
+"""
+Cache of access tokens whose signature has already been verified.
+
+Entries are keyed by a SHA-256 digest of the token (the token itself is not
+kept) and expire at the token's own `exp`, so a cached token is never
+accepted for longer than a verified one would be. Each entry remembers the
+algorithm and key it was verified with; when those settings change (key
+rotation) the whole cache is dropped and tokens are verified again.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework_simplejwt import settings as jwt_settings
+
+
+def _key_fingerprint():
+    # Looked up through the module: simplejwt replaces api_settings when SIMPLE_JWT changes.
+    api_settings = jwt_settings.api_settings
+    return (api_settings.ALGORITHM, api_settings.VERIFYING_KEY or api_settings.SIGNING_KEY)
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._fingerprint = None
+        self._lock = threading.Lock()
+        
+    def get(self, token):
+        """Claims of a previously verified, unexpired token, or None."""
+        if not self.max_entries:
+            return None
+        digest = hashlib.sha256(token.encode()).digest()
+        fingerprint = _key_fingerprint()
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._entries.clear()
+                self._fingerprint = fingerprint
+                return None
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return dict(payload)
+        
+    def put(self, token, payload):
+        if not self.max_entries or 'exp' not in payload:
+            return
+        digest = hashlib.sha256(token.encode()).digest()
+        fingerprint = _key_fingerprint()
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self._entries.clear()
+                self._fingerprint = fingerprint
+            self._entries[digest] = (dict(payload), payload['exp'])
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            
+    def __len__(self):
+        return len(self._entries)
+    
+    
+_token_cache = None
+_token_cache_lock = threading.Lock()
+
+
+def get_token_cache():
+    global _token_cache
+    if _token_cache is None:
+        with _token_cache_lock:
+            if _token_cache is None:
+                _token_cache = VerifiedTokenCache(getattr(settings, 'VERIFIED_TOKEN_CACHE_SIZE', 10_000))
+    return _token_cache
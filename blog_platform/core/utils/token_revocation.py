@@ -0,0 +1,143 @@
+"""
+Revocation of JWTs by their `jti` claim.
+
+Revoked ids are stored durably in users.RevokedToken. Each process also
+keeps a Bloom filter of the ids that have not expired yet, so checking a
+token that was never revoked (the common case) is a few hashes in memory.
+Only a filter hit, which is either a real revocation or a rare false
+positive, is confirmed against the table.
+
+The filter picks up revocations made by other processes by loading rows
+newer than the last one it has seen, at most every SYNC_INTERVAL seconds,
+and is rebuilt from scratch every REBUILD_INTERVAL seconds to drop expired
+ids. Revocations made in the same process apply immediately.
+"""
+import datetime
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.utils import timezone
+
+
+class BloomFilter:
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.sha256(key.encode()).digest()
+        first = int.from_bytes(digest[:8], 'big')
+        second = int.from_bytes(digest[8:16], 'big') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationStore:
+    def __init__(self, sync_interval, rebuild_interval, error_rate, capacity):
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.error_rate = error_rate
+        self.capacity = capacity
+        self._filter = None
+        self._last_id = 0
+        self._synced_at = 0.0
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def _rebuild(self, now):
+        from users.models import RevokedToken
+
+        # Read the watermark first: rows added meanwhile are loaded twice rather than missed.
+        last_id = RevokedToken.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        jtis = list(RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list('jti', flat=True))
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter, self._last_id = bloom, last_id
+        self._built_at = self._synced_at = now
+
+    def _sync(self):
+        """The current filter, refreshed from the table if SYNC_INTERVAL has passed."""
+        from users.models import RevokedToken
+
+        now = time.monotonic()
+        bloom = self._filter
+        if bloom is not None and now - self._synced_at < self.sync_interval:
+            return bloom
+        with self._lock:
+            if self._filter is not None and now - self._synced_at < self.sync_interval:
+                return self._filter
+            if self._filter is None or now - self._built_at >= self.rebuild_interval:
+                self._rebuild(now)
+                return self._filter
+            for row_id, jti in RevokedToken.objects.filter(id__gt=self._last_id).order_by('id').values_list('id', 'jti'):
+                self._filter.add(jti)
+                self._last_id = row_id
+            if self._filter.count > self._filter.capacity:
+                self._rebuild(now)
+            self._synced_at = now
+            return self._filter
+
+    def is_revoked(self, jti):
+        from users.models import RevokedToken
+
+        if not jti:
+            return False
+        if jti not in self._sync():
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, exp):
+        """Revoke token `jti` until its expiry `exp` (a unix timestamp)."""
+        from users.models import RevokedToken
+
+        if not jti:
+            return
+        expires_at = datetime.datetime.fromtimestamp(exp, tz=datetime.timezone.utc)
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=jti, expires_at=expires_at)],
+            ignore_conflicts=True,
+        )
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def prune(self):
+        """Delete revocations of tokens that have expired. Returns the number removed."""
+        from users.models import RevokedToken
+
+        deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+        with self._lock:
+            self._filter = None
+        return deleted
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_revocation_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                options = getattr(settings, 'TOKEN_REVOCATION', {})
+                _store = RevocationStore(
+                    sync_interval=options.get('SYNC_INTERVAL', 5),
+                    rebuild_interval=options.get('REBUILD_INTERVAL', 60 * 60),
+                    error_rate=options.get('FALSE_POSITIVE_RATE', 0.001),
+                    capacity=options.get('INITIAL_CAPACITY', 10_000),
+                )
+    return _store
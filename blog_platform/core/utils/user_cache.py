@@ -0,0 +1,95 @@
+"""
+Cross-request cache of user rows for the authentication path.
+
+Entries live in a bounded per-process LRU with a TTL and are tagged with a
+per-user version kept in the shared Django cache (core.utils.cache_version).
+Saving or deleting a user bumps that version (users.signals), so every
+worker treats its copy as stale on the next lookup and changes such as
+deactivation take effect immediately.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from .cache_version import get_cache_version, bump_cache_version
+
+
+def _version_name(user_id):
+    return f'user:{user_id}'
+
+
+class UserCache:
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, user_id, loader):
+        """
+        The user with `user_id`, from the cache when the entry is fresh and
+        its version is current, otherwise from `loader(user_id)`. Callers get
+        their own copy, so changes to it never leak into the cache.
+        """
+        if not self.ttl:
+            return loader(user_id)
+        version = get_cache_version(_version_name(user_id))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == version and entry[2] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return copy.copy(entry[1])
+            self.misses += 1
+            
+        user = loader(user_id)
+        if user is None:
+            return None
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (version, copy.copy(user), now + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+    
+    def invalidate(self, user_id):
+        bump_cache_version(_version_name(user_id))
+        with self._lock:
+            self._entries.pop(user_id, None)
+            
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+            }
+        
+        
+_user_cache = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache():
+    global _user_cache
+    if _user_cache is None:
+        with _user_cache_lock:
+            if _user_cache is None:
+                options = getattr(settings, 'USER_CACHE', {})
+                _user_cache = UserCache(
+                    ttl=options.get('TTL', 5 * 60),
+                    max_entries=options.get('MAX_ENTRIES', 10_000),
+                )
+    return _user_cache
@@ -1,14 +1,12 @@
 from django.shortcuts import redirect
-from core.utils.jwt_helper import JWTHelper
+from core.utils.auth_context import get_auth_context
 
 class JWTLoginRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
-        access_token = request.COOKIES.get('access_token')
-        if access_token and JWTHelper.is_token_valid(access_token):
-            if not hasattr(request, 'user') or not request.user.is_authenticated:
-                request.user = JWTHelper.get_user_from_token(access_token)
-            if request.user:
-                return super().dispatch(request, *args, **kwargs)
+        user = get_auth_context(request).user
+        if user:
+            request.user = user
+            return super().dispatch(request, *args, **kwargs)
         return redirect('login')
     
 class SuperUserRequiredMixin(JWTLoginRequiredMixin):
@@ -27,15 +25,12 @@ class NormalUserOnlyMixin(JWTLoginRequiredMixin):
         
 class RedirectAuthenticatedUserMixin:
     def dispatch(self, request, *args, **kwargs):
-        access_token = request.COOKIES.get('access_token')
-        if access_token and JWTHelper.is_token_valid(access_token):
-            user = JWTHelper.get_user_from_token(access_token)
-            
-            if user:
-                if user.is_superuser or user.is_staff:
-                    return redirect('admin_users_list')
-                else:
-                    return redirect('home')
+        user = get_auth_context(request).user
+        if user:
+            if user.is_superuser or user.is_staff:
+                return redirect('admin_users_list')
+            else:
+                return redirect('home')
         return super().dispatch(request, *args, **kwargs)
     
 class ActiveSectionMixin:
@@ -0,0 +1,29 @@
+from django import template
+from django.utils.html import format_html
+
+register = template.Library()
+
+@register.simple_tag
+def cover_picture(post, sizes='100vw', alt='', css_class='', style='', loading='lazy'):
+    """
+    Render a post cover as <picture> with WebP/JPEG srcsets from the
+    precomputed variants, falling back to the original upload.
+    """
+    variants = post.cover_image_variants
+    if not variants:
+        return format_html(
+            '<img src="{}" class="{}" alt="{}" style="{}" loading="{}">',
+            post.cover_image.url, css_class, alt, style, loading,
+        )
+
+    if variants.get('placeholder'):
+        style = f"{style} background: url('{variants['placeholder']}') center / cover no-repeat;".strip()
+    webp = variants['srcset'].get('webp')
+    source = format_html('<source type="image/webp" srcset="{}" sizes="{}">', webp, sizes) if webp else ''
+    return format_html(
+        '<picture class="d-block w-100 h-100">{}'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" class="{}" alt="{}" style="{}" loading="{}" decoding="async">'
+        '</picture>',
+        source, variants['src'], variants['srcset'].get('jpeg', ''), sizes,
+        variants['width'], variants['height'], css_class, alt, style, loading,
+    )
@@ -1,13 +1,15 @@
-import random
+from html import unescape
 from django import template
-from bs4 import BeautifulSoup
+from django.utils.html import escape, strip_tags
 
 register = template.Library()
 
 @register.filter
 def short_content(post, length=150):
-        soup = BeautifulSoup(post.content, "html.parser")
-        text = soup.get_text()
+        text = post.excerpt
+        if not text and 'content' not in post.get_deferred_fields():
+            # Rows written without going through Post.save().
+            text = ' '.join(unescape(strip_tags(post.content)).split())
         snippet = text[:length] + ('...' if len(text) > length else '')
         
-        return f"<p>{snippet}</p>"    
\ No newline at end of file
+        return f"<p>{escape(snippet)}</p>"    
@@ -1,3 +1,48 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from core.testing import BlogTestCase, login, make_user
+from core.utils.cache_version import bump_cache_version, get_cache_version
+from posts.models import Post
+from .templatetags.short_content import short_content
 
-# Create your tests here.
+
+class ShortContentTests(BlogTestCase):
+    def test_uses_the_stored_excerpt_escaped_and_truncated(self):
+        post = self.make_post(content='<p>1 &lt; 2 and ' + 'x' * 200 + '</p>')
+        card = Post.objects.for_card().get(pk=post.pk)
+        with self.assertNumQueries(0):
+            html = short_content(card, 10)
+        self.assertEqual(html, '<p>1 &lt; 2 and ...</p>')
+
+    def test_falls_back_to_content_for_rows_without_excerpt(self):
+        post = self.make_post(content='<p>Fresh <i>text</i></p>')
+        Post.objects.filter(pk=post.pk).update(excerpt='')
+        self.assertEqual(short_content(Post.objects.get(pk=post.pk)), '<p>Fresh text</p>')
+
+
+class HomeFragmentCacheTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        login(self.client, make_user('reader'))
+
+    def test_versions_bump_and_never_repeat_after_eviction(self):
+        version = get_cache_version('things')
+        self.assertEqual(bump_cache_version('things'), version + 1)
+        self.assertEqual(get_cache_version('things'), version + 1)
+        cache.delete('cache_version:things')
+        self.assertGreater(get_cache_version('things'), version + 1)
+        self.assertGreater(bump_cache_version('unseen'), version + 1)
+
+    def test_warm_home_page_runs_no_post_queries(self):
+        self.make_post('Cached post')
+        self.assertContains(self.client.get('/'), 'Cached post')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertContains(self.client.get('/'), 'Cached post')
+        self.assertFalse([query for query in queries.captured_queries if 'posts_' in query['sql']])
+
+    def test_post_changes_invalidate_fragments(self):
+        self.make_post('First post')
+        self.client.get('/')
+        self.make_post('Second post')
+        self.assertContains(self.client.get('/'), 'Second post')
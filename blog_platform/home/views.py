@@ -1,45 +1,87 @@
+from functools import partial
 from django.views.generic import TemplateView
 from core.views.mixins import JWTLoginRequiredMixin, NormalUserOnlyMixin
 from django.views import View
-from posts.models import Post
+from posts.models import Post, Category
+from posts.utils.search import ranked_post_ids
+from posts.signals import POSTS_CACHE_VERSION
+from core.utils.cache_version import get_cache_version
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.shortcuts import render
 from posts.utils.ip import get_client_ip
-from users.models import CustomUser
-from django.db.models import Q
+from core.utils.site_stats import get_site_stats
+    
+SORT_OPTIONS = ('trending', 'popular', 'recent')
     
 class HomeView(NormalUserOnlyMixin, View):
     template_name = 'home/home.html'
     
     def get(self, request, *args, **kwargs):
- 
-        featured_posts = Post.objects.select_related('author', 'category').prefetch_related('comments').filter(is_draft=False).order_by('-view_count', '-created_at')[:3]
-
-        recent_posts = Post.objects.prefetch_related('author', 'category').prefetch_related('comments').filter(is_draft=False).order_by('-created_at')[:2]
+        sort = request.GET.get('sort')
+        if sort not in SORT_OPTIONS:
+            sort = 'trending'
         
-        total_posts = Post.objects.filter(is_draft=False).count()
+        # Querysets stay lazy: they only hit the database when the matching
+        # {% cache %} fragment in the template is cold.
+        published_posts = Post.objects.published()
         
-        total_readers = CustomUser.objects.filter(Q(is_superuser=False) | Q(is_staff=False)).count()
+        if sort == 'trending':
+            # Called by the template, so it still only runs on a cold cache.
+            featured_posts = partial(Post.objects.top_trending, 3)
+        else:
+            featured_posts = published_posts.for_card().sorted_by(sort)[:3]
+
+        recent_posts = published_posts.for_card().order_by('-created_at')[:2]
         
-        total_writers = CustomUser.objects.filter(Q(is_superuser=True) | Q(is_superuser=True)).count()
+        site_stats = get_site_stats()
         
         context = {
+            'content_version': get_cache_version(POSTS_CACHE_VERSION),
+            'fragment_timeout': settings.HOME_FRAGMENT_CACHE_TIMEOUT,
+            'sort': sort,
             'featured_posts':featured_posts,
             'recent_posts':recent_posts,
-            'total_posts': total_posts,
-            'total_readers': total_readers,
-            'total_writers': total_writers
+            'total_posts': site_stats['total_posts'],
+            'total_readers': site_stats['total_readers'],
+            'total_writers': site_stats['total_writers'],
         }
         
         return render(request, self.template_name, context=context)
 
 class PostListView(NormalUserOnlyMixin, View):
     template_name = 'home/post_list.html'
+    paginate_by = 12
     
     def get(self, request, *args, **kwargs):
- 
-        posts = Post.objects.select_related('author', 'category').prefetch_related('comments').filter(is_draft=False).order_by('-view_count', '-created_at')
+        search = request.GET.get('search', '').strip()
+        category_id = request.GET.get('category', '')
+        category_id = int(category_id) if category_id.isdigit() else None
+        sort = request.GET.get('sort')
+        if sort not in SORT_OPTIONS:
+            sort = 'popular'
+        page_number = request.GET.get('page')
         
-        return render(request, self.template_name, context={'posts':posts})
+        if search:
+            # Rank with the search index, then load only the posts on this page.
+            page = Paginator(ranked_post_ids(search, category_id), self.paginate_by).get_page(page_number)
+            post_ids = [row['post_id'] for row in page.object_list]
+            posts_by_id = Post.objects.published().for_card().in_bulk(post_ids)
+            page.object_list = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+        else:
+            posts = Post.objects.published().for_card().sorted_by(sort)
+            if category_id:
+                posts = posts.filter(category_id=category_id)
+            page = Paginator(posts, self.paginate_by).get_page(page_number)
+            
+        categories = list(Category.objects.values('id', 'name').order_by('name'))
+        context = {
+            'posts': page,
+            'categories': categories,
+            'selected_category': next((c for c in categories if c['id'] == category_id), None),
+            'sort': sort,
+        }
+        return render(request, self.template_name, context=context)
 
 class PostDetailView(NormalUserOnlyMixin, TemplateView):
     template_name = 'home/post_detail.html'    
@@ -47,10 +89,8 @@ class PostDetailView(NormalUserOnlyMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         post_id = self.kwargs.get('post_id')  
-        post_data = Post.objects.get(id=post_id)
-        user_id = self.request.user.id
-        is_liked = post_data.reactions.filter(user_id = user_id).exists()
+        post_data = Post.objects.with_related().with_is_liked(self.request.user).get(id=post_id)
         context['post'] = post_data
-        context['is_liked'] = is_liked
+        context['is_liked'] = post_data.is_liked
         return context        
         
@@ -0,0 +1,15 @@
+from core.utils.pagination import KeysetPagination
+
+
+class PostCursorPagination(KeysetPagination):
+    """Admin post list, newest edits first. Backed by post_updated_id_idx."""
+    ordering = ('-updated_at', '-id')
+    page_size = 20
+    max_page_size = 100
+
+
+class CommentCursorPagination(KeysetPagination):
+    """Reader comment list, newest first. Backed by comment_post_created_idx."""
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 50
@@ -1,7 +1,19 @@
 from rest_framework.serializers import Serializer, ModelSerializer, ValidationError, SerializerMethodField, CharField
-from ..models import Post, Category, Comment
+from django.conf import settings
+from ..models import Post, Category, Comment, AttachmentUpload
+from ..utils.chunked_upload import received_chunks
 from rest_framework import serializers
 
+ALLOWED_ATTACHMENT_TYPES = [
+    'application/pdf', 'application/msword',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'application/vnd.ms-powerpoint', 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+    'text/plain', 'application/zip', 'application/x-rar-compressed',
+    'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp',
+    'video/mp4', 'audio/mpeg', 'audio/wav', 'audio/mp3'
+]
+
 class CategorySerializer(ModelSerializer):
     class Meta:
         model = Category
@@ -9,16 +21,20 @@ class CategorySerializer(ModelSerializer):
         
 
 class PostSerializer(serializers.ModelSerializer):
-    like_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
     category = CategorySerializer(read_only=True)
     category_id = serializers.IntegerField(write_only=True, required=False)
+    cover_image_variants = serializers.ReadOnlyField()
+    attachment_name = serializers.ReadOnlyField()
+    attachment_size = serializers.ReadOnlyField()
+    attachment_type = serializers.ReadOnlyField(source='get_attachment_type')
+    attachment_sha256 = serializers.ReadOnlyField()
 
     class Meta:
         model = Post
         fields = [
             'id', 'title', 'author', 'category_id', 'content',
-            'cover_image', 'attachment', 'is_draft', 'created_at',
+            'cover_image', 'cover_image_variants', 'attachment', 'attachment_name',
+            'attachment_size', 'attachment_type', 'attachment_sha256', 'is_draft', 'created_at',
             'updated_at', 'category', 'view_count', 'like_count',
             'comment_count'
         ]
@@ -46,28 +62,13 @@ class PostSerializer(serializers.ModelSerializer):
         if value:
             if len(value.name) > 100:
                 raise serializers.ValidationError('Attachment file name must be less than 100 characters.')
-            allowed_types = [
-                'application/pdf', 'application/msword',
-                'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                'application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                'application/vnd.ms-powerpoint', 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
-                'text/plain', 'application/zip', 'application/x-rar-compressed',
-                'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp',
-                'video/mp4', 'audio/mpeg', 'audio/wav', 'audio/mp3'
-            ]
-            if value.content_type not in allowed_types:
+            if value.content_type not in ALLOWED_ATTACHMENT_TYPES:
                 raise serializers.ValidationError('Unsupported file type.')
             max_size = 10 * 1024 * 1024
             if value.size > max_size:
                 raise serializers.ValidationError('File must be less than 10MB.')
         return value
 
-    def get_like_count(self, obj):
-        return obj.reactions.count()
-
-    def get_comment_count(self, obj):
-        return obj.comments.count()
-
     def create(self, validated_data):
         is_draft = validated_data.get('is_draft')
         if isinstance(is_draft, str):
@@ -84,6 +85,34 @@ class PostSerializer(serializers.ModelSerializer):
             validated_data['is_draft'] = is_draft.lower() == 'true'
         return super().update(instance, validated_data)
 
+class BulkPostFilterSerializer(Serializer):
+    category = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(required=False)
+    is_draft = serializers.BooleanField(required=False)
+    updated_before = serializers.DateTimeField(required=False)
+    updated_after = serializers.DateTimeField(required=False)
+    
+
+class BulkPostActionSerializer(Serializer):
+    MAX_IDS = 1000
+    
+    action = serializers.ChoiceField(choices=['publish', 'unpublish', 'change_category', 'delete'])
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, max_length=MAX_IDS)
+    filter = BulkPostFilterSerializer(required=False)
+    category_id = serializers.IntegerField(required=False)
+    dry_run = serializers.BooleanField(default=False)
+    
+    def validate(self, data):
+        if bool(data.get('ids')) == bool(data.get('filter')):
+            raise serializers.ValidationError('Provide either a non-empty "ids" list or a "filter".')
+        if data['action'] == 'change_category':
+            if not data.get('category_id'):
+                raise serializers.ValidationError('category_id is required to change category.')
+            if not Category.objects.filter(id=data['category_id']).exists():
+                raise serializers.ValidationError('Invalid category selected.')
+        return data
+    
+
 class UserCommentSerializer(ModelSerializer):
     user = serializers.StringRelatedField(read_only=True)
     
@@ -95,4 +124,39 @@ class UserCommentSerializer(ModelSerializer):
     def create(self, validated_data):
         # Author is current user
         validated_data['user'] = self.context['request'].user
-        return super().create(validated_data) 
\ No newline at end of file
+        return super().create(validated_data) 
+
+
+class AttachmentUploadSerializer(ModelSerializer):
+    post_id = serializers.PrimaryKeyRelatedField(source='post', queryset=Post.objects.all())
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = SerializerMethodField()
+    
+    class Meta:
+        model = AttachmentUpload
+        fields = ['id', 'post_id', 'filename', 'content_type', 'size', 'chunk_size', 'total_chunks', 'received_chunks', 'status', 'created_at']
+        read_only_fields = ['chunk_size', 'status', 'created_at']
+        
+    def get_received_chunks(self, obj):
+        return received_chunks(obj)
+    
+    def validate_filename(self, value):
+        value = value.replace('\\', '/').split('/')[-1]
+        if not value:
+            raise serializers.ValidationError('A file name is required.')
+        return value
+    
+    def validate_content_type(self, value):
+        if value not in ALLOWED_ATTACHMENT_TYPES:
+            raise serializers.ValidationError('Unsupported file type.')
+        return value
+    
+    def validate_size(self, value):
+        max_size = settings.ATTACHMENT_UPLOADS['MAX_SIZE']
+        if not 0 < value <= max_size:
+            raise serializers.ValidationError(f'File must be between 1 byte and {max_size // (1024 * 1024)}MB.')
+        return value
+    
+    def create(self, validated_data):
+        validated_data['chunk_size'] = settings.ATTACHMENT_UPLOADS['CHUNK_SIZE']
+        return super().create(validated_data)
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostViewSet, CategoryView, PostLIkeStatusAPIView, UserCommentListCreateView, PostRecordAPIView, CommentApprovalStatusAPIView
+from .views import PostViewSet, CategoryView, PostLIkeStatusAPIView, PostLikeBatchAPIView, UserCommentListCreateView, PostRecordAPIView, CommentApprovalStatusAPIView
+from .views import PostAttachmentDownloadAPIView, AttachmentUploadAPIView, AttachmentUploadDetailAPIView, AttachmentUploadChunkAPIView, AttachmentUploadCompleteAPIView
 
 router = DefaultRouter()
 router.register(r'post', PostViewSet, basename='post')
@@ -9,10 +10,16 @@ urlpatterns = [
     path('', include(router.urls)),
     path('category/', CategoryView.as_view()),
     path('<int:pk>/like/', PostLIkeStatusAPIView.as_view(), name='post_like_status'),
+    path('likes/', PostLikeBatchAPIView.as_view(), name='post_like_batch'),
     path('comments/', UserCommentListCreateView.as_view(), name='user_comment_list_create'),
     path('<int:post_id>/view/', PostRecordAPIView.as_view(), name='view'),
     path('<int:comment_id>/toggle-comment/', CommentApprovalStatusAPIView.as_view(), name='toggle_comment'),
     path('approve-comments/', CommentApprovalStatusAPIView.as_view(), name='approve_comments'),
+    path('<int:post_id>/attachment/', PostAttachmentDownloadAPIView.as_view(), name='post_attachment_download'),
+    path('uploads/', AttachmentUploadAPIView.as_view(), name='attachment_upload'),
+    path('uploads/<uuid:upload_id>/', AttachmentUploadDetailAPIView.as_view(), name='attachment_upload_detail'),
+    path('uploads/<uuid:upload_id>/chunks/<int:index>/', AttachmentUploadChunkAPIView.as_view(), name='attachment_upload_chunk'),
+    path('uploads/<uuid:upload_id>/complete/', AttachmentUploadCompleteAPIView.as_view(), name='attachment_upload_complete'),
     
     
 ]
@@ -1,7 +1,8 @@
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.views import APIView
-from ..models import Post, Category, Comment, PostView
-from .serializers import PostSerializer, CategorySerializer, UserCommentSerializer
+from ..models import Post, Category, Comment, PostView, PostReaction, AttachmentUpload
+from .serializers import PostSerializer, CategorySerializer, UserCommentSerializer, BulkPostActionSerializer, AttachmentUploadSerializer
+from .pagination import PostCursorPagination, CommentCursorPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.renderers import JSONRenderer
 from rest_framework import status
@@ -10,21 +11,38 @@ from rest_framework.generics import ListCreateAPIView
 from core.utils.responses import success_response, error_response
 import logging
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.http import http_date, content_disposition_header
+from django.db.models import Q, Count
+from django.db import transaction, IntegrityError
 from ..utils.ip import get_client_ip
+from ..signals import POSTS_CACHE_VERSION
+from core.utils.cache_version import bump_cache_version
+from core.utils.site_stats import adjust_site_stats, reconcile_site_stats
+from ..utils.counters import bump_post_counters, recount_post_counters
+from ..utils.view_buffer import get_view_buffer
+from ..utils.view_dedupe import is_new_view
+from ..utils.trending import record_trending_event, record_trending_events
+from ..utils.search import index_post, unindex_post
+from ..utils import chunked_upload
+from ..utils.downloads import RangeNotSatisfiable, download_settings, iter_file_range, parse_range, presigned_url
+from django.utils import timezone
 
 logger = logging.getLogger('posts')
 
 class PostViewSet(ModelViewSet):
-    queryset = Post.objects.select_related('category', 'author').all().order_by('-updated_at')
+    queryset = Post.objects.with_related().order_by('-updated_at')
     serializer_class = PostSerializer
     permission_classes = [IsAdminUser]
+    pagination_class = PostCursorPagination
     
     def perform_create(self, serializer):
         """
         Save a new post with the request user as author
         """        
-        serializer.save(author=self.request.user)
+        post = serializer.save(author=self.request.user)
+        if not post.is_draft:
+            adjust_site_stats(total_posts=1)
         
     def create(self, request, *args, **kwargs):
         """
@@ -51,9 +69,12 @@ class PostViewSet(ModelViewSet):
         Update post instance with partial data
         """
         instance = self.get_object()
+        was_draft = instance.is_draft
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
+        if instance.is_draft != was_draft:
+            adjust_site_stats(total_posts=-1 if instance.is_draft else 1)
         return success_response(message='Post updated successfully')
 
                 
@@ -65,6 +86,7 @@ class PostViewSet(ModelViewSet):
         post = self.get_object()
         post.is_draft = not post.is_draft
         post.save()
+        adjust_site_stats(total_posts=-1 if post.is_draft else 1)
         return success_response(message='Post status updated successfully.')
     
     def destroy(self, request, *args, **kwargs):
@@ -73,7 +95,95 @@ class PostViewSet(ModelViewSet):
         """
         post = self.get_object()
         post.delete()
+        adjust_site_stats(
+            total_posts=0 if post.is_draft else -1,
+            total_views=-post.view_count,
+            total_likes=-post.like_count,
+            total_comments=-post.approved_comment_count,
+        )
         return success_response(message='Post deleted successfully.')
+    
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Publish, unpublish, re-categorize or delete many posts at once.
+        Targets are an "ids" list or a "filter" (category, author, is_draft,
+        updated_before, updated_after). Rows are changed with one set-based
+        UPDATE/DELETE in a transaction; "dry_run" only reports what would change.
+        """
+        serializer = BulkPostActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        action_name = data['action']
+        
+        posts = Post.objects.all()
+        if data.get('ids'):
+            posts = posts.filter(id__in=data['ids'])
+        else:
+            posts = self._filter_bulk_targets(posts, data['filter'])
+            
+        with transaction.atomic():
+            matched = list(posts.select_for_update().values_list('id', 'is_draft', 'category_id'))
+            if action_name == 'publish':
+                to_change = [post_id for post_id, is_draft, _ in matched if is_draft]
+            elif action_name == 'unpublish':
+                to_change = [post_id for post_id, is_draft, _ in matched if not is_draft]
+            elif action_name == 'change_category':
+                to_change = [post_id for post_id, _, category_id in matched if category_id != data['category_id']]
+            else:
+                to_change = [post_id for post_id, _, _ in matched]
+                
+            if not data['dry_run'] and to_change:
+                targets = Post.objects.filter(id__in=to_change)
+                if action_name == 'delete':
+                    targets.delete()
+                elif action_name == 'change_category':
+                    targets.update(category_id=data['category_id'], updated_at=timezone.now())
+                else:
+                    targets.update(is_draft=action_name == 'unpublish', updated_at=timezone.now())
+                    
+        if not data['dry_run'] and to_change:
+            self._after_bulk_change(action_name, to_change)
+            
+        changed = set(to_change)
+        outcome = 'deleted' if action_name == 'delete' else 'updated'
+        results = {post_id: outcome if post_id in changed else 'unchanged' for post_id, _, _ in matched}
+        for post_id in data.get('ids') or []:
+            results.setdefault(post_id, 'not_found')
+        return success_response(
+            message=f"{'Would change' if data['dry_run'] else 'Changed'} {len(to_change)} posts",
+            data={
+                'action': action_name,
+                'dry_run': data['dry_run'],
+                'matched': len(matched),
+                'affected': len(to_change),
+                'results': results,
+            }
+        )
+        
+    def _filter_bulk_targets(self, posts, filters):
+        lookups = {
+            'category': 'category_id',
+            'author': 'author_id',
+            'is_draft': 'is_draft',
+            'updated_before': 'updated_at__lt',
+            'updated_after': 'updated_at__gte',
+        }
+        return posts.filter(**{lookups[name]: value for name, value in filters.items()})
+    
+    def _after_bulk_change(self, action_name, post_ids):
+        """Bring derived data in line after a set-based change, which skips model signals."""
+        if action_name == 'publish':
+            for post in Post.objects.filter(id__in=post_ids).only('id', 'title', 'content', 'is_draft'):
+                index_post(post)
+            adjust_site_stats(total_posts=len(post_ids))
+        elif action_name == 'unpublish':
+            for post_id in post_ids:
+                unindex_post(post_id)
+            adjust_site_stats(total_posts=-len(post_ids))
+        elif action_name == 'delete':
+            reconcile_site_stats()
+        bump_cache_version(POSTS_CACHE_VERSION)
   
   
 class CategoryView(APIView):
@@ -91,61 +201,112 @@ class PostLIkeStatusAPIView(APIView):
     """
     Handles retrieving like status and toggling like for a post.
     GET: Retrieve total likes and if current user liked the post.
-    POST: Toggle like/unlike for the current user.
+    POST: Toggle like/unlike for the current user. An optional boolean
+    `like` in the body sets the state explicitly, which is idempotent.
     """
     permission_classes = [IsAuthenticated]
     
-    def get_post(self, pk):
-        return get_object_or_404(Post.objects.prefetch_related('reactions'), pk=pk)
-    
     def get(self, request, pk):
-        post = self.get_post(pk)
-        total_likes = post.reactions.count()
-        is_liked = post.reactions.filter(user=request.user).exists()
+        post = Post.objects.filter(pk=pk).with_is_liked(request.user).values('id', 'like_count', 'is_liked').first()
+        if post is None:
+            raise Http404
         return success_response(data={
-            'post_id': post.id,
-            'total_likes': total_likes,
-            'is_liked': is_liked,
+            'post_id': post['id'],
+            'total_likes': post['like_count'],
+            'is_liked': post['is_liked'],
         })
         
     def post(self, request, pk):
-        post = self.get_post(pk)
         user = request.user
+        like = request.data.get('like')
+        if like is not None:
+            like = str(like).lower() == 'true'
         
-        liked = post.reactions.filter(user=user).exists()
-        if liked:
-            post.reactions.filter(user=user).delete()
-            is_liked = False
-            message = "Post unliked."
-        else:
-            post.reactions.create(user=user)
-            is_liked = True
-            message = "Post liked."
+        with transaction.atomic():
+            removed = 0
+            if like is not True:
+                removed, _ = PostReaction.objects.filter(post_id=pk, user=user).delete()
+                if removed:
+                    self._bump_like_count(pk, -1)
+                    
+            if like is True or (like is None and not removed):
+                if self._add_reaction(pk, user):
+                    self._bump_like_count(pk, 1)
+                    record_trending_event(pk, 'like')
+                is_liked = True
+                message = "Post liked."
+            else:
+                is_liked = False
+                message = "Post unliked."
             
-        total_likes = post.reactions.count()
-        print(total_likes)
+        total_likes = Post.objects.filter(pk=pk).values_list('like_count', flat=True).first()
+        if total_likes is None:
+            raise Http404
         return success_response(
             message=message,
             data={
-                "post_id": post.id,
+                "post_id": pk,
                 "total_likes": total_likes,
                 "is_liked": is_liked
             }
         )        
+        
+    def _add_reaction(self, pk, user):
+        """Insert the like; False if a concurrent request already did."""
+        try:
+            with transaction.atomic():
+                PostReaction.objects.create(post_id=pk, user=user)
+            return True
+        except IntegrityError:
+            return False
+        
+    def _bump_like_count(self, pk, delta):
+        # Also serves as the existence check: rolls the reaction back for unknown posts.
+        if not bump_post_counters(pk, like_count=delta):
+            raise Http404
+        adjust_site_stats(total_likes=delta)
                     
         
+class PostLikeBatchAPIView(APIView):
+    """
+    Like state for many posts in one request.
+    GET ?ids=1,2,3 -> {post_id: {total_likes, is_liked}} for the existing posts.
+    """
+    permission_classes = [IsAuthenticated]
+    max_ids = 200
+    
+    def get(self, request):
+        try:
+            post_ids = {int(value) for value in request.query_params.get('ids', '').split(',') if value.strip()}
+        except ValueError:
+            return error_response(message='ids must be a comma separated list of integers')
+        if len(post_ids) > self.max_ids:
+            return error_response(message=f'At most {self.max_ids} ids are allowed per request')
+        
+        like_counts = dict(Post.objects.filter(id__in=post_ids).values_list('id', 'like_count'))
+        liked = set(
+            PostReaction.objects.filter(user=request.user, post_id__in=like_counts).values_list('post_id', flat=True)
+        )
+        return success_response(data={
+            post_id: {'total_likes': total_likes, 'is_liked': post_id in liked}
+            for post_id, total_likes in like_counts.items()
+        })
+        
+        
 class UserCommentListCreateView(ListCreateAPIView):
     """
-    List approved comments and current user's comments for a post.
+    List approved comments and current user's comments for a post, one
+    keyset-paginated page at a time with the approved total in X-Total-Count.
     Also allows the user to create new comments.
     """
     serializer_class = UserCommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentCursorPagination
     
     def get_queryset(self):
         user = self.request.user
-        post_id = self.request.query_params.get('post')
-        if not post_id:
+        post_id = self.request.query_params.get('post', '')
+        if not post_id.isdigit():
             return Comment.objects.none()
         
         # Approved comments for the post + current user's own comments (pending or approved)
@@ -153,16 +314,31 @@ class UserCommentListCreateView(ListCreateAPIView):
             post_id=post_id
         ).filter(
             Q(is_approved=True) | Q(user=user)
-        ).select_related('user').order_by('-created_at')
+        ).select_related('user').order_by('-created_at', '-id')
+    
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        post_id = request.query_params.get('post', '')
+        if post_id.isdigit():
+            total = Post.objects.filter(pk=post_id).values_list('approved_comment_count', flat=True).first()
+            response['X-Total-Count'] = total or 0
+        return response
+    
+    @transaction.atomic
+    def perform_create(self, serializer):
+        comment = serializer.save()
+        bump_post_counters(comment.post_id, comment_count=1)
         
         
 class PostRecordAPIView(APIView):
-    """Handles post view count"""
+    """
+    Handles post view count.
+    Views are buffered and written in batches, see posts.utils.view_buffer.
+    Repeat views from the same viewer inside the dedupe window are not recorded.
+    """
     permission_classes = [IsAuthenticated]
     
     def post(self,request,post_id):
-        post = get_object_or_404(Post, id=post_id)
-        
         user = request.user
         
         if user.is_superuser or user.is_staff:
@@ -170,10 +346,10 @@ class PostRecordAPIView(APIView):
         
         ip = get_client_ip(request)      
         
-        PostView.objects.create(user=user, post=post, ip_address=ip)
+        if not is_new_view(post_id, user_id=user.id, ip_address=ip):
+            return success_response(message='View already recorded')
         
-        post.view_count = post.view_count + 1
-        post.save(update_fields=['view_count'])
+        get_view_buffer().record(post_id, user.id, ip)
         
         return success_response(message='View recorded', status_code=status.HTTP_201_CREATED)
         
@@ -185,14 +361,202 @@ class CommentApprovalStatusAPIView(APIView):
     def patch(self, request, comment_id=None):
         
             if comment_id is not None:
-                comment = get_object_or_404(Comment, id=comment_id)
-                comment.is_approved = not comment.is_approved
-                comment.save()
+                with transaction.atomic():
+                    comment = get_object_or_404(Comment.objects.select_for_update(), id=comment_id)
+                    comment.is_approved = not comment.is_approved
+                    comment.save()
+                    bump_post_counters(comment.post_id, approved_comment_count=1 if comment.is_approved else -1)
+                    if comment.is_approved:
+                        record_trending_event(comment.post_id, 'comment')
+                adjust_site_stats(total_comments=1 if comment.is_approved else -1)
                 return success_response(message='status changed', data={'is_approved':comment.is_approved})
             
-            comment = Comment.objects.filter(is_approved=False).update(is_approved=True)
+            with transaction.atomic():
+                pending = Comment.objects.filter(is_approved=False)
+                pending_per_post = dict(pending.values_list('post_id').annotate(total=Count('id')).order_by())
+                comment = pending.update(is_approved=True)
+                recount_post_counters(list(pending_per_post))
+                record_trending_events((post_id, 'comment', total) for post_id, total in pending_per_post.items())
+            bump_cache_version(POSTS_CACHE_VERSION)
+            adjust_site_stats(total_comments=comment)
             
             return success_response(message='all comments accepted', data={'approved_count':comment})            
             
             
-          
\ No newline at end of file
+          
+
+
+class AttachmentUploadAPIView(APIView):
+    """
+    Start a chunked attachment upload.
+    POST {post_id, filename, content_type, size} -> upload id, chunk_size and total_chunks.
+    The client then PUTs each chunk and calls complete; see the views below.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request):
+        serializer = AttachmentUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.save(user=request.user)
+        return success_response(message='Upload started', data=AttachmentUploadSerializer(upload).data, status_code=status.HTTP_201_CREATED)
+    
+    
+class AttachmentUploadDetailAPIView(APIView):
+    """
+    GET: upload state, including the chunks already received, for resuming.
+    DELETE: abort the upload and drop its staged chunks.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, upload_id):
+        upload = get_object_or_404(AttachmentUpload, id=upload_id, user=request.user)
+        return success_response(data=AttachmentUploadSerializer(upload).data)
+    
+    def delete(self, request, upload_id):
+        upload = get_object_or_404(AttachmentUpload, id=upload_id, user=request.user)
+        chunked_upload.discard(upload)
+        upload.delete()
+        return success_response(message='Upload cancelled')
+    
+    
+class AttachmentUploadChunkAPIView(APIView):
+    """
+    PUT the raw bytes of chunk `index` (application/octet-stream). The body
+    is streamed to the staging directory, never buffered whole in memory.
+    """
+    permission_classes = [IsAdminUser]
+    
+    def put(self, request, upload_id, index):
+        upload = get_object_or_404(AttachmentUpload, id=upload_id, user=request.user)
+        if upload.status != AttachmentUpload.STATUS_UPLOADING:
+            return error_response(message='Upload is already being completed', status_code=status.HTTP_409_CONFLICT)
+        stream = request.stream
+        if stream is None:
+            return error_response(message='Chunk body is empty')
+        try:
+            received = chunked_upload.write_chunk(upload, index, stream)
+        except chunked_upload.ChunkError as e:
+            return error_response(message=str(e))
+        return success_response(data={'index': index, 'size': received})
+    
+    
+class AttachmentUploadCompleteAPIView(APIView):
+    """Assemble the received chunks and set the file as the post's attachment."""
+    permission_classes = [IsAdminUser]
+    
+    def post(self, request, upload_id):
+        # Claim the upload under a row lock; a concurrent complete finds it
+        # already completing instead of assembling the same file twice.
+        with transaction.atomic():
+            upload = get_object_or_404(
+                AttachmentUpload.objects.select_for_update(of=('self',)).select_related('post'), id=upload_id, user=request.user,
+            )
+            if upload.status != AttachmentUpload.STATUS_UPLOADING:
+                return error_response(message='Upload is already being completed', status_code=status.HTTP_409_CONFLICT)
+            missing = chunked_upload.missing_chunks(upload)
+            if missing:
+                return error_response(message='Upload is incomplete', error={'missing_chunks': missing})
+            upload.status = AttachmentUpload.STATUS_COMPLETING
+            upload.save(update_fields=['status', 'updated_at'])
+        
+        post = upload.post
+        try:
+            with chunked_upload.assembled_file(upload) as assembled:
+                post.attachment = assembled
+                post.save(update_fields=['attachment', 'updated_at'])
+        except Exception:
+            # Let the client retry completing.
+            AttachmentUpload.objects.filter(pk=upload.pk).update(status=AttachmentUpload.STATUS_UPLOADING)
+            raise
+        chunked_upload.discard(upload)
+        upload.delete()
+        return success_response(
+            message='Attachment uploaded successfully',
+            data={'post_id': post.id, 'attachment': post.attachment.url, 'attachment_name': post.attachment_name},
+        )
+
+
+class PostAttachmentDownloadAPIView(APIView):
+    """
+    Download a post's attachment. Streams from storage in fixed-size blocks
+    with Range/If-Range, ETag and Last-Modified support, or redirects to a
+    presigned storage URL when ATTACHMENT_DOWNLOADS['REDIRECT_TO_STORAGE'] is on.
+    Draft attachments are only available to staff. HEAD requests get the
+    same headers but are not counted as downloads.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def perform_content_negotiation(self, request, force=False):
+        # The file is served whatever the client Accepts (e.g. application/pdf);
+        # DRF's own error responses fall back to the first renderer.
+        renderer = self.get_renderers()[0]
+        return renderer, renderer.media_type
+    
+    def get(self, request, post_id):
+        post = get_object_or_404(
+            Post.objects.only('id', 'is_draft', 'attachment', 'updated_at', *Post.ATTACHMENT_METADATA_FIELDS),
+            id=post_id,
+        )
+        if not post.attachment or (post.is_draft and not request.user.is_staff):
+            raise Http404
+        
+        storage = post.attachment.storage
+        name = post.attachment.name
+        size = post.attachment_file_size
+        if size is None:
+            # Rows not yet covered by backfill_attachment_metadata.
+            size = storage.size(name)
+        etag = f'"{post.attachment_sha256}"' if post.attachment_sha256 else f'W/"{post.id}-{size}-{int(post.updated_at.timestamp())}"'
+        last_modified = http_date(post.updated_at.timestamp())
+        
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match and (if_none_match.strip() == '*' or etag in [tag.strip() for tag in if_none_match.split(',')]):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+        
+        options = download_settings()
+        if options['REDIRECT_TO_STORAGE'] and size >= options['REDIRECT_MIN_SIZE']:
+            url = presigned_url(storage, name, post.attachment_name)
+            if url:
+                if request.method == 'GET':
+                    bump_post_counters(post.id, attachment_download_count=1)
+                return HttpResponseRedirect(url)
+        
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if range_header and if_range and not self._if_range_matches(if_range.strip(), etag, last_modified):
+            range_header = None
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        
+        start, end = byte_range or (0, size - 1)
+        if request.method == 'GET' and start == 0:
+            # Resumed or segmented downloads are counted once, by their first range.
+            bump_post_counters(post.id, attachment_download_count=1)
+        response = StreamingHttpResponse(
+            iter_file_range(storage, name, start, end) if request.method == 'GET' else (),
+            status=status.HTTP_206_PARTIAL_CONTENT if byte_range else status.HTTP_200_OK,
+            content_type=post.attachment_mime_type or 'application/octet-stream',
+        )
+        if byte_range:
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        response['Content-Disposition'] = content_disposition_header(as_attachment=True, filename=post.attachment_name)
+        response['Cache-Control'] = 'private'
+        return response
+    
+    @staticmethod
+    def _if_range_matches(validator, etag, last_modified):
+        """If-Range needs a strong validator (RFC 9110 13.1.5); weak ETags never match."""
+        if validator.startswith('"'):
+            return not etag.startswith('W/') and validator == etag
+        return validator == last_modified
+
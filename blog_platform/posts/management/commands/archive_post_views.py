@@ -0,0 +1,31 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from posts.utils.view_archive import archive_views_before
+
+
+class Command(BaseCommand):
+    help = (
+        'Move PostView rows older than the retention window into gzip JSONL '
+        'archive files on the default storage. Meant to run daily from cron.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.POST_VIEW_RETENTION_DAYS,
+            help='Keep this many days of raw views in the live table.',
+        )
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would move.')
+        
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        total = 0
+        for count, names in archive_views_before(cutoff, options['chunk_size'], options['dry_run']):
+            total += count
+            for name in names:
+                self.stdout.write(f'Archived to {name}')
+                
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {total} post views older than {cutoff:%Y-%m-%d %H:%M}.'))
@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from posts.models import Post
+from posts.utils.files import inspect_file
+
+
+def _inspect(post):
+    original_name = post.attachment.name.split('/')[-1]
+    with post.attachment.open('rb') as attachment:
+        return original_name, inspect_file(attachment, original_name)
+
+
+class Command(BaseCommand):
+    help = (
+        'Record size, MIME type, original name and SHA-256 for attachments '
+        'uploaded before the metadata was stored. Files are read from storage '
+        'in parallel, one batch at a time.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--workers', type=int, default=8, help='Files read from storage concurrently.')
+        parser.add_argument('--force', action='store_true', help='Recompute metadata that is already stored.')
+        
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(attachment='').exclude(attachment__isnull=True)
+        if not options['force']:
+            posts = posts.filter(attachment_sha256='')
+        posts = posts.only('id', 'attachment', *Post.ATTACHMENT_METADATA_FIELDS).order_by('id')
+        
+        updated = failed = 0
+        last_id = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                batch = list(posts.filter(id__gt=last_id)[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                futures = [(post, executor.submit(_inspect, post)) for post in batch]
+                inspected = []
+                for post, future in futures:
+                    try:
+                        original_name, metadata = future.result()
+                    except Exception as exc:
+                        failed += 1
+                        self.stderr.write(f'Post {post.pk}: {exc}')
+                        continue
+                    post.set_attachment_metadata(original_name, metadata)
+                    inspected.append(post)
+                Post.objects.bulk_update(inspected, Post.ATTACHMENT_METADATA_FIELDS)
+                updated += len(inspected)
+                
+        self.stdout.write(self.style.SUCCESS(f'Recorded metadata for {updated} attachments ({failed} failed).'))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from posts.models import Post
+from posts.utils.images import generate_cover_variants
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate responsive variants for existing cover images. New uploads '
+        'get them automatically; this is only needed once for older rows.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate variants that already exist.')
+        
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(cover_image='').exclude(cover_image__isnull=True)
+        count = failed = 0
+        for post in posts.only('id', 'cover_image', 'cover_variants').iterator(chunk_size=100):
+            if not options['force'] and post.cover_variants.get('source') == post.cover_image.name:
+                continue
+            try:
+                variants = generate_cover_variants(post.cover_image)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f'Post {post.pk}: {exc}')
+                continue
+            Post.objects.filter(pk=post.pk).update(cover_variants=variants)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Generated variants for {count} posts ({failed} failed).'))
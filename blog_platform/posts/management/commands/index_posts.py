@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from posts.models import Post
+from posts.utils.search import index_post
+
+
+class Command(BaseCommand):
+    help = (
+        'Add existing posts to the search index. New and edited posts are '
+        'indexed automatically; this is only needed once for older rows.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--missing-only', action='store_true', help='Skip posts that are already indexed.')
+        
+    def handle(self, *args, **options):
+        posts = Post.objects.published()
+        if options['missing_only']:
+            posts = posts.filter(search_document__isnull=True)
+        count = 0
+        for post in posts.only('id', 'title', 'content', 'is_draft').iterator(chunk_size=500):
+            index_post(post)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} posts.'))
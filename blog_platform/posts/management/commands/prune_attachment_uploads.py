@@ -0,0 +1,26 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from posts.models import AttachmentUpload
+from posts.utils.chunked_upload import discard, upload_settings
+
+
+class Command(BaseCommand):
+    help = 'Delete chunked attachment uploads that were never completed, together with their staged chunks.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours', type=int, default=None,
+            help='Hours without a new chunk after which an unfinished upload is dropped (default: ATTACHMENT_UPLOADS["EXPIRY_HOURS"]).',
+        )
+        
+    def handle(self, *args, **options):
+        hours = options['hours'] if options['hours'] is not None else upload_settings()['EXPIRY_HOURS']
+        # updated_at moves with every accepted chunk, see chunked_upload.write_chunk.
+        stale = AttachmentUpload.objects.filter(updated_at__lt=timezone.now() - timedelta(hours=hours))
+        count = 0
+        for upload in stale.iterator():
+            discard(upload)
+            upload.delete()
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Pruned {count} unfinished uploads.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from posts.utils.trending import rebuild_trending_scores
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute trending scores from recent views, likes and approved '
+        'comments. Scores are maintained incrementally; use this to seed them.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=14)
+        
+    def handle(self, *args, **options):
+        count = rebuild_trending_scores(options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt trending scores for {count} posts.'))
@@ -0,0 +1,18 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from posts.utils.view_archive import restore_views
+
+
+class Command(BaseCommand):
+    help = 'Re-hydrate archived PostView rows for a date range (inclusive, YYYY-MM-DD).'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('start', type=date.fromisoformat)
+        parser.add_argument('end', type=date.fromisoformat)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        
+    def handle(self, *args, **options):
+        if options['end'] < options['start']:
+            raise CommandError('end must not be before start.')
+        count = restore_views(options['start'], options['end'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Restored {count} archived post views."))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    PostReaction = apps.get_model('posts', 'PostReaction')
+    Comment = apps.get_model('posts', 'Comment')
+
+    def _count(model, **filters):
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk'), **filters)
+            .order_by()
+            .values('post')
+            .annotate(total=Count('id'))
+            .values('total')[:1]
+        ), 0)
+
+    Post.objects.update(
+        like_count=_count(PostReaction),
+        comment_count=_count(Comment),
+        approved_comment_count=_count(Comment, is_approved=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0009_remove_postreaction_reaction_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_post_updated_id_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='postview',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
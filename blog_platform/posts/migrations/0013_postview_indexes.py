@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_postview_viewed_at_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='postview',
+            index=models.Index(fields=['viewed_at'], name='postview_viewed_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postview',
+            index=models.Index(fields=['post', '-viewed_at'], name='postview_post_viewed_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:13
+
+from bs4 import BeautifulSoup
+from django.db import migrations, models
+
+EXCERPT_LENGTH = 300
+
+
+def backfill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    batch = []
+    for post in Post.objects.only('id', 'content').iterator(chunk_size=500):
+        text = ' '.join(BeautifulSoup(post.content or '', 'html.parser').get_text(' ').split())
+        post.excerpt = text[:EXCERPT_LENGTH + 1]
+        batch.append(post)
+        if len(batch) >= 500:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0020_attachment_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='attachment_file_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='attachment_mime_type',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='attachment_original_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='attachment_sha256',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
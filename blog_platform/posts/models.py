@@ -1,6 +1,13 @@
+import math
+import uuid
 from django.db import models
+from django.db.models import Exists, OuterRef, Value, F
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from core.models.base import TimeStampedModel 
+from .utils.text import html_to_text
+from .utils.images import cover_srcsets
+from .utils.files import inspect_file
 
 
 User = get_user_model()
@@ -12,49 +19,179 @@ class Category(models.Model):
     def __str__(self):
         return self.name
     
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(is_draft=False)
+    
+    def with_related(self):
+        return self.select_related('author', 'category')
+    
+    def for_card(self):
+        """
+        Projection for post cards: joins author/category and skips the full
+        content column, cards render the precomputed `excerpt` instead.
+        """
+        return self.with_related().defer('content')
+    
+    def with_stats(self):
+        """
+        Annotate like and approved comment counts read from the denormalized
+        counter columns, no joins. recount_post_counters() repairs drifted
+        counters.
+        """
+        return self.annotate(
+            likes=F('like_count'),
+            approved_comments=F('approved_comment_count'),
+        )
+    
+    def trending(self):
+        """
+        Order by decayed trending score; posts without activity come last.
+        This sorts every matching post, use top_trending() for a top-N list.
+        """
+        return self.order_by(F('trending__score').desc(nulls_last=True), '-created_at')
+    
+    def top_trending(self, limit):
+        """
+        The `limit` published posts with the highest trending score, as card
+        projections. Walks post_trending_score_idx from the top instead of
+        sorting every post, then fills up with the newest posts when fewer
+        have a score.
+        """
+        scores = (
+            PostTrendingScore.objects.filter(post__is_draft=False)
+            .select_related('post__author', 'post__category')
+            .defer('post__content')
+            .order_by('-score')[:limit]
+        )
+        posts = [score.post for score in scores]
+        if len(posts) < limit:
+            posts += self.published().for_card().exclude(pk__in=[post.pk for post in posts]).order_by('-created_at')[:limit - len(posts)]
+        return posts
+    
+    def sorted_by(self, sort):
+        if sort == 'trending':
+            return self.trending()
+        if sort == 'recent':
+            return self.order_by('-created_at')
+        return self.order_by('-view_count', '-created_at')
+    
+    def with_is_liked(self, user):
+        if user is None or not getattr(user, 'is_authenticated', False):
+            return self.annotate(is_liked=Value(False))
+        return self.annotate(
+            is_liked=Exists(PostReaction.objects.filter(post=OuterRef('pk'), user=user))
+        )
+
+
 class Post(TimeStampedModel):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='posts')
     title = models.CharField(max_length=255)
     content = models.TextField()
+    # Plain-text prefix of content, derived on save for cards and listings.
+    excerpt = models.TextField(blank=True, default='', editable=False)
     cover_image = models.ImageField(upload_to='post_images', blank=True, null=True)
+    # Resized copies of cover_image, see posts.utils.images.
+    cover_variants = models.JSONField(default=dict, blank=True, editable=False)
     attachment = models.FileField(upload_to='post_attachment', blank=True, null=True)
+    # Recorded when the attachment is uploaded so reads never hit the storage backend.
+    attachment_original_name = models.CharField(max_length=255, blank=True, default='', editable=False)
+    attachment_file_size = models.PositiveBigIntegerField(null=True, blank=True, editable=False)
+    attachment_mime_type = models.CharField(max_length=100, blank=True, default='', editable=False)
+    attachment_sha256 = models.CharField(max_length=64, blank=True, default='', editable=False)
+    attachment_download_count = models.PositiveIntegerField(default=0)
     view_count = models.PositiveIntegerField(default=0)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    approved_comment_count = models.PositiveIntegerField(default=0)
     is_draft = models.BooleanField(default=False)
     
+    objects = PostQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at', '-id'], name='post_updated_id_idx'),
+        ]
+    
+    EXCERPT_LENGTH = 300
+    ATTACHMENT_METADATA_FIELDS = ['attachment_original_name', 'attachment_file_size', 'attachment_mime_type', 'attachment_sha256']
+    
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        content_loaded = 'content' not in self.get_deferred_fields()
+        if content_loaded and (update_fields is None or 'content' in update_fields):
+            self.excerpt = self.build_excerpt(self.content)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        if update_fields is None or 'attachment' in update_fields:
+            if self.update_attachment_metadata() and update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], *self.ATTACHMENT_METADATA_FIELDS}
+        super().save(*args, **kwargs)
+        
+    def update_attachment_metadata(self):
+        """
+        Record metadata for a newly assigned attachment (still local, not yet
+        uploaded) or clear it when the attachment was removed. Returns whether
+        anything changed.
+        """
+        if not self.attachment:
+            if not (self.attachment_original_name or self.attachment_file_size or self.attachment_mime_type or self.attachment_sha256):
+                return False
+            self.set_attachment_metadata('', {'size': None, 'mime_type': '', 'sha256': ''})
+            return True
+        if self.attachment._committed:
+            return False
+        original_name = self.attachment.name.replace('\\', '/').split('/')[-1]
+        self.set_attachment_metadata(original_name, inspect_file(self.attachment.file, original_name))
+        return True
+    
+    def set_attachment_metadata(self, original_name, metadata):
+        self.attachment_original_name = original_name[:255]
+        self.attachment_file_size = metadata['size']
+        self.attachment_mime_type = metadata['mime_type']
+        self.attachment_sha256 = metadata['sha256']
+        
+    @classmethod
+    def build_excerpt(cls, content):
+        # One extra character so readers can tell the text was cut.
+        return html_to_text(content)[:cls.EXCERPT_LENGTH + 1]
+    
+    @property
+    def cover_image_variants(self):
+        """srcset data for the cover image, or {} until variants exist."""
+        if not self.cover_image or self.cover_variants.get('source') != self.cover_image.name:
+            return {}
+        return cover_srcsets(self.cover_image.storage, self.cover_variants)
+    
     @property
     def attachment_name(self):
         if self.attachment:
-            return self.attachment.name.split('/')[-1]
+            return self.attachment_original_name or self.attachment.name.split('/')[-1]
         return None
     
     @property
     def attachment_size(self):
         if self.attachment: 
-            try:
-                self.attachment.size
-            except:
-                return 0
-            return 0
+            return self.attachment_file_size or 0
+        return 0
         
     @property   
     def get_attachment_type(self):
         if self.attachment:
-            import mimetypes
-            mime_type, _ = mimetypes.guess_type(self.attachment.name)
-            return mime_type
+            return self.attachment_mime_type or None
         return None   
          
     @property   
     def total_comments(self):
-        return self.comments.filter(is_approved=True).count()
+        return self.approved_comment_count
     
     @property   
     def total_likes(self):
-        return self.reactions.count()
+        return self.like_count
     
     @property   
     def is_published(self):
@@ -77,6 +214,12 @@ class Comment(TimeStampedModel):
     content = models.TextField()
     is_approved = models.BooleanField(default=False)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+            models.Index(fields=['is_approved', '-created_at', '-id'], name='comment_status_created_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.user.username} on {self.post.title}"
         
@@ -84,8 +227,100 @@ class PostView(models.Model):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='views')
     ip_address = models.GenericIPAddressField()
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    viewed_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['viewed_at'], name='postview_viewed_at_idx'),
+            models.Index(fields=['post', '-viewed_at'], name='postview_post_viewed_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user} viewed {self.post.title}"
     
+    
+
+class AttachmentUpload(TimeStampedModel):
+    """
+    A resumable, chunked upload of a post attachment. Received chunks live
+    in the staging directory until the upload is completed, see
+    posts.utils.chunked_upload.
+    """
+    STATUS_UPLOADING = 'uploading'
+    STATUS_COMPLETING = 'completing'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, 'Uploading'),
+        (STATUS_COMPLETING, 'Completing'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='attachment_uploads')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='attachment_uploads')
+    filename = models.CharField(max_length=100)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # Moves to completing under a row lock, so only one request assembles the file.
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    
+    @property
+    def total_chunks(self):
+        return max(1, math.ceil(self.size / self.chunk_size))
+    
+    def chunk_length(self, index):
+        """Expected byte length of chunk `index`; only the last one may be short."""
+        if index == self.total_chunks - 1:
+            return self.size - index * self.chunk_size
+        return self.chunk_size
+    
+    def __str__(self):
+        return f"{self.filename} for {self.post_id}"
+    
+
+class SearchTerm(models.Model):
+    """A token in the post search index, with the number of posts containing it."""
+    term = models.CharField(max_length=64, unique=True)
+    document_count = models.PositiveIntegerField(default=0)
+    
+    def __str__(self):
+        return self.term
+    
+    
+class SearchDocument(models.Model):
+    """Per-post entry in the search index, holding the token length used by BM25."""
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    length = models.PositiveIntegerField(default=0)
+    
+    
+class SearchPosting(models.Model):
+    """Occurrences of a term in a post. doc_length is copied from SearchDocument so ranking needs no join."""
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name='postings')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='search_postings')
+    frequency = models.PositiveIntegerField()
+    doc_length = models.PositiveIntegerField()
+    
+    class Meta:
+        unique_together = ('term', 'post')
+        
+    def __str__(self):
+        return f"{self.term} in {self.post_id}"
+    
+    
+class PostTrendingScore(models.Model):
+    """
+    Materialized, time-decayed engagement score of a post.
+    `score` is stored in log2 form normalized to a fixed epoch, so newer
+    activity outranks older activity without rewriting every row as time
+    passes; see posts.utils.trending.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score'], name='post_trending_score_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.post_id}: {self.score}"
@@ -0,0 +1,86 @@
+import logging
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from core.utils.cache_version import bump_cache_version
+from core.utils.site_stats import invalidate_site_stats
+from .models import Post, Comment, PostReaction
+from .utils.counters import recount_post_counters
+from .utils.search import index_post, unindex_post
+from .utils.images import generate_cover_variants, delete_cover_variants
+
+logger = logging.getLogger('posts')
+
+User = get_user_model()
+
+# Version of cached reader-facing post fragments, see home/home.html.
+POSTS_CACHE_VERSION = 'posts'
+
+SEARCH_FIELDS = {'title', 'content', 'is_draft'}
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SEARCH_FIELDS & set(update_fields)):
+        return
+    index_post(instance)
+        
+        
+@receiver(post_save, sender=Post)
+def update_cover_variants(sender, instance, raw=False, **kwargs):
+    current = instance.cover_image.name if instance.cover_image else None
+    if raw or instance.cover_variants.get('source') == current:
+        return
+    storage = Post._meta.get_field('cover_image').storage
+    delete_cover_variants(storage, instance.cover_variants)
+    variants = {}
+    if current:
+        try:
+            variants = generate_cover_variants(instance.cover_image)
+        except Exception:
+            logger.exception('Failed to generate cover variants for post %s', instance.pk)
+            # Remember the source so the original keeps being served without retrying on every save.
+            variants = {'source': current}
+    instance.cover_variants = variants
+    Post.objects.filter(pk=instance.pk).update(cover_variants=variants)
+
+
+@receiver(post_delete, sender=Post)
+def remove_cover_variants(sender, instance, **kwargs):
+    delete_cover_variants(Post._meta.get_field('cover_image').storage, instance.cover_variants)
+
+
+@receiver(pre_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+    
+@receiver(pre_delete, sender=User)
+def remember_engaged_posts(sender, instance, **kwargs):
+    """Other people's posts that lose this user's likes and comments in the cascade."""
+    reactions = PostReaction.objects.filter(user=instance).exclude(post__author=instance)
+    comments = Comment.objects.filter(user=instance).exclude(post__author=instance)
+    instance._engaged_post_ids = (
+        set(reactions.values_list('post_id', flat=True)) | set(comments.values_list('post_id', flat=True))
+    )
+
+
+@receiver(post_delete, sender=User)
+def recount_engaged_posts(sender, instance, **kwargs):
+    post_ids = getattr(instance, '_engaged_post_ids', None)
+    if post_ids:
+        recount_post_counters(post_ids)
+    # The user's posts, likes and comments are gone without going through adjust_site_stats().
+    transaction.on_commit(invalidate_site_stats)
+
+    
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=PostReaction)
+@receiver(post_delete, sender=PostReaction)
+def invalidate_post_fragments(sender, raw=False, **kwargs):
+    if not raw:
+        bump_cache_version(POSTS_CACHE_VERSION)
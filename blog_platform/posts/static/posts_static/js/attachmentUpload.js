@@ -0,0 +1,73 @@
+import { post, get } from "/static/core_static/js/api.js";
+import { endpoints } from "/static/core_static/js/apiEndpoints.js";
+
+// Chunked, resumable attachment upload:
+// start (or resume) an upload, PUT every missing chunk, then complete it.
+const MAX_RETRIES = 3;
+const storageKey = (postId, file) => `attachmentUpload:${postId}:${file.name}:${file.size}:${file.lastModified}`;
+
+async function putChunk(url, blob) {
+    const csrfToken = document.querySelector('[name=csrfmiddlewaretoken]')?.value;
+
+    for (let attempt = 1; ; attempt++) {
+        try {
+            const response = await fetch(url, {
+                method: 'PUT',
+                headers: {
+                    'Content-Type': 'application/octet-stream',
+                    'X-CSRFToken': csrfToken,
+                },
+                body: blob,
+            });
+            if (response.ok) return;
+            if (response.status < 500 || attempt >= MAX_RETRIES) {
+                const data = await response.json().catch(() => ({}));
+                throw new Error(data.message || 'Failed to upload attachment');
+            }
+        } catch (error) {
+            if (attempt >= MAX_RETRIES) throw error;
+        }
+        await new Promise(resolve => setTimeout(resolve, 1000 * attempt));
+    }
+}
+
+async function startUpload(postId, file) {
+    const savedId = localStorage.getItem(storageKey(postId, file));
+    if (savedId) {
+        const { response, data } = await get(endpoints.attachment_upload_detail(savedId));
+        if (response.ok) return data.data;
+        localStorage.removeItem(storageKey(postId, file));
+    }
+
+    const { response, data } = await post(endpoints.attachment_upload, {
+        post_id: postId,
+        filename: file.name,
+        content_type: file.type,
+        size: file.size,
+    });
+    if (!response.ok) {
+        const details = Object.values(data || {}).flat().join('\n');
+        throw new Error(details || 'Failed to start attachment upload');
+    }
+    localStorage.setItem(storageKey(postId, file), data.data.id);
+    return data.data;
+}
+
+export async function uploadAttachment(postId, file, onProgress = () => {}) {
+    const upload = await startUpload(postId, file);
+    const received = new Set(upload.received_chunks);
+
+    for (let index = 0; index < upload.total_chunks; index++) {
+        if (!received.has(index)) {
+            const start = index * upload.chunk_size;
+            await putChunk(endpoints.attachment_upload_chunk(upload.id, index), file.slice(start, start + upload.chunk_size));
+            received.add(index);
+        }
+        onProgress(received.size / upload.total_chunks);
+    }
+
+    const { response, data } = await post(endpoints.attachment_upload_complete(upload.id));
+    if (!response.ok) throw new Error(data.message || 'Failed to complete attachment upload');
+    localStorage.removeItem(storageKey(postId, file));
+    return data.data;
+}
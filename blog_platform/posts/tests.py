@@ -1,3 +1,982 @@
-from django.test import TestCase
+import base64
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from unittest import mock
+from django.test import override_settings
+from django.utils import timezone
+from core.testing import BlogTestCase, TempStorageMixin, login, make_user
+from core.utils.site_stats import get_site_stats
+from home.templatetags.cover_image import cover_picture
+from PIL import Image
+from .models import AttachmentUpload, Category, Comment, Post, PostReaction, PostTrendingScore, PostView
+from .utils import chunked_upload, view_buffer
+from .utils.downloads import RangeNotSatisfiable, iter_file_range, parse_range
+from .utils.files import inspect_file, sniff_mime_type
+from .utils.counters import bump_post_counters, recount_post_counters
+from .utils.search import ranked_post_ids, tokenize
+from .utils.trending import rebuild_trending_scores, record_trending_events
+from .utils import view_dedupe
+from .utils.view_archive import archive_views_before, restore_views
+from .utils.view_buffer import CacheViewBufferBackend, LocalViewBufferBackend, ViewBuffer, ViewEvent
+from .utils.view_dedupe import ExpiringLRUSet, is_new_view
 
-# Create your tests here.
+User = get_user_model()
+
+
+class PostCounterTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.reader = make_user('reader')
+        login(self.client, self.reader)
+
+    def test_like_toggle_keeps_like_count(self):
+        url = f'/api/posts/{self.post.id}/like/'
+        self.assertEqual(self.client.post(url).json()['data']['total_likes'], 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+
+        self.assertEqual(self.client.post(url).json()['data']['total_likes'], 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_comment_create_and_approval_keep_counts(self):
+        response = self.client.post('/api/posts/comments/', {'post': self.post.id, 'content': 'Nice'})
+        self.assertEqual(response.status_code, 201)
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.approved_comment_count), (1, 0))
+
+        login(self.client, self.author)
+        comment = Comment.objects.get(post=self.post)
+        self.client.patch(f'/api/posts/{comment.id}/toggle-comment/')
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.post.approved_comment_count), (1, 1))
+
+    def test_bump_never_goes_below_zero_and_reports_missing_posts(self):
+        self.assertEqual(bump_post_counters(self.post.id, like_count=-5), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertEqual(bump_post_counters(self.post.id + 1000, like_count=1), 0)
+
+    def test_recount_repairs_drift(self):
+        PostReaction.objects.create(user=self.reader, post=self.post)
+        Comment.objects.create(user=self.reader, post=self.post, content='a', is_approved=True)
+        Post.objects.filter(pk=self.post.pk).update(like_count=7, comment_count=0)
+
+        recount_post_counters([self.post.id])
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count, self.post.approved_comment_count), (1, 1, 1))
+
+    def test_deleting_a_user_recounts_their_likes_and_comments(self):
+        PostReaction.objects.create(user=self.reader, post=self.post)
+        Comment.objects.create(user=self.reader, post=self.post, content='a', is_approved=True)
+        recount_post_counters([self.post.id])
+
+        self.reader.delete()
+        self.post.refresh_from_db()
+        self.assertEqual((self.post.like_count, self.post.comment_count, self.post.approved_comment_count), (0, 0, 0))
+
+
+class PostQuerySetTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.published = self.make_post('Published')
+        self.draft = self.make_post('Draft', is_draft=True)
+        self.reader = make_user('reader')
+
+    def test_published_excludes_drafts(self):
+        self.assertEqual(list(Post.objects.published()), [self.published])
+
+    def test_for_card_skips_the_content_column(self):
+        post = Post.objects.for_card().get(pk=self.published.pk)
+        self.assertIn('content', post.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual((post.author.username, post.category.name), ('author', 'Tech'))
+
+    def test_with_stats_reads_the_counters(self):
+        PostReaction.objects.create(user=self.reader, post=self.published)
+        Comment.objects.create(user=self.reader, post=self.published, content='a', is_approved=True)
+        Comment.objects.create(user=self.reader, post=self.published, content='b')
+        recount_post_counters([self.published.id])
+        with self.assertNumQueries(1):
+            post = Post.objects.with_stats().get(pk=self.published.pk)
+        self.assertEqual((post.likes, post.approved_comments, post.comment_count), (1, 1, 2))
+        self.assertNotIn('JOIN', str(Post.objects.with_stats().query))
+
+    def test_with_is_liked_for_user(self):
+        PostReaction.objects.create(user=self.reader, post=self.published)
+        liked = dict(Post.objects.with_is_liked(self.reader).values_list('id', 'is_liked'))
+        self.assertEqual(liked, {self.published.id: True, self.draft.id: False})
+
+    def test_with_is_liked_for_anonymous_user(self):
+        from django.contrib.auth.models import AnonymousUser
+
+        PostReaction.objects.create(user=self.reader, post=self.published)
+        for user in (None, AnonymousUser()):
+            self.assertFalse(any(Post.objects.with_is_liked(user).values_list('is_liked', flat=True)))
+
+
+class PostKeysetPaginationTests(BlogTestCase):
+    url = '/api/posts/post/'
+
+    def setUp(self):
+        super().setUp()
+        self.posts = [self.make_post(f'Post {i}') for i in range(5)]
+        login(self.client, self.author)
+
+    def _page(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_pages_forward_and_back_without_gaps(self):
+        expected = [post.id for post in sorted(self.posts, key=lambda post: (post.updated_at, post.id), reverse=True)]
+        first = self._page(self.url, page_size=2)
+        self.assertFalse(first['has_previous'])
+        seen = [post['id'] for post in first['results']]
+        page = first
+        while page['next']:
+            page = self._page(page['next'])
+            seen += [post['id'] for post in page['results']]
+        self.assertEqual(seen, expected)
+        self.assertFalse(page['has_next'])
+
+        second = self._page(first['next'])
+        back = self._page(second['previous'])
+        self.assertEqual([post['id'] for post in back['results']], expected[:2])
+
+    def test_page_size_is_capped(self):
+        self.assertEqual(self._page(self.url, page_size=1000)['page_size'], 100)
+
+    def test_malformed_cursors_are_rejected(self):
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        for cursor in ('not-base64!', encode({'p': [1]}), encode({'p': ['notadate', 1]}), encode({'p': [None, 1]})):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get(self.url, {'cursor': cursor}).status_code, 404)
+
+    def test_readers_cannot_list(self):
+        login(self.client, make_user('reader'))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ViewBufferTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+
+    def test_synchronous_buffer_writes_each_view(self):
+        buffer = ViewBuffer(LocalViewBufferBackend(), flush_interval=0, flush_size=100)
+        buffer.record(self.post.id, None, '10.0.0.1')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+        self.assertEqual(PostView.objects.filter(post=self.post).count(), 1)
+
+    def test_views_are_written_in_batches(self):
+        # The interval is long enough that the background flush never runs here.
+        buffer = ViewBuffer(LocalViewBufferBackend(), flush_interval=3600, flush_size=3)
+        buffer.record(self.post.id, None, '10.0.0.1')
+        buffer.record(self.post.id, None, '10.0.0.2')
+        self.assertEqual(PostView.objects.count(), 0)
+
+        buffer.record(self.post.id, None, '10.0.0.3')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 3)
+        self.assertEqual(len(buffer.backend), 0)
+
+    def test_failed_flush_requeues_events(self):
+        buffer = ViewBuffer(LocalViewBufferBackend(), flush_interval=3600, flush_size=100)
+        buffer.record(self.post.id, None, '10.0.0.1')
+        buffer.record(self.post.id + 1000, None, '10.0.0.1')
+        with mock.patch.object(PostView.objects, 'bulk_create', side_effect=RuntimeError('database down')), \
+                self.assertLogs('posts', 'ERROR'):
+            self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(len(buffer.backend), 2)
+
+        # Views of posts that no longer exist are dropped.
+        self.assertEqual(buffer.flush(), 2)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+    def test_views_of_deleted_users_are_kept_anonymous(self):
+        reader = make_user('reader')
+        buffer = ViewBuffer(LocalViewBufferBackend(), flush_interval=3600, flush_size=100)
+        buffer.record(self.post.id, reader.id, '10.0.0.1')
+        buffer.record(self.post.id, self.author.id, '10.0.0.2')
+        reader.delete()
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(
+            sorted(PostView.objects.values_list('user_id', flat=True), key=str),
+            sorted([None, self.author.id], key=str),
+        )
+
+    def test_requeue_is_bounded(self):
+        for backend in (LocalViewBufferBackend(max_events=3), CacheViewBufferBackend(prefix='test_views', max_events=3)):
+            with self.subTest(backend=type(backend).__name__):
+                events = [ViewEvent(self.post.id, None, f'10.0.0.{i}', None) for i in range(5)]
+                backend.push(events[0])
+                self.assertEqual(backend.requeue(events[1:]), 2)
+                self.assertEqual(len(backend), 3)
+                self.assertEqual(backend.requeue(events[:1]), 1)
+                self.assertEqual(len(backend), 3)
+
+    def test_cache_backend_drain_waits_for_unwritten_slots(self):
+        backend = CacheViewBufferBackend(prefix='test_views', gap_timeout=3600)
+        event = ViewEvent(self.post.id, None, '10.0.0.1', None)
+        backend.push(event)
+        # A concurrent push that has claimed position 2 but not written it yet.
+        cache.incr('test_views:tail')
+        backend.push(event)
+
+        self.assertEqual(len(backend.drain(10)), 1)
+        self.assertEqual(backend.drain(10), [])
+        cache.set('test_views:2', tuple(event))
+        self.assertEqual(len(backend.drain(10)), 2)
+        self.assertEqual(len(backend), 0)
+
+    @override_settings(POST_VIEW_BUFFER={'FLUSH_INTERVAL': 0}, POST_VIEW_DEDUPE_WINDOW=0)
+    def test_view_endpoint_records_reader_views_only(self):
+        view_buffer._buffer = None
+        self.addCleanup(setattr, view_buffer, '_buffer', None)
+        url = f'/api/posts/{self.post.id}/view/'
+
+        login(self.client, self.author)
+        self.assertEqual(self.client.post(url).status_code, 200)
+        login(self.client, make_user('reader'))
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+
+
+class ViewDedupeTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        view_dedupe._seen = None
+        self.addCleanup(setattr, view_dedupe, '_seen', None)
+
+    def test_repeat_views_inside_the_window_are_not_new(self):
+        self.assertTrue(is_new_view(1, user_id=5))
+        self.assertFalse(is_new_view(1, user_id=5))
+        self.assertTrue(is_new_view(2, user_id=5))
+        self.assertTrue(is_new_view(1, ip_address='10.0.0.1'))
+        self.assertFalse(is_new_view(1, ip_address='10.0.0.1'))
+
+    @override_settings(POST_VIEW_DEDUPE_WINDOW=0)
+    def test_window_of_zero_disables_dedupe(self):
+        self.assertTrue(is_new_view(1, user_id=5))
+        self.assertTrue(is_new_view(1, user_id=5))
+
+    def test_set_expires_and_stays_bounded(self):
+        seen = ExpiringLRUSet(ttl=60, max_entries=2)
+        with mock.patch('posts.utils.view_dedupe.time.monotonic', return_value=100):
+            self.assertTrue(seen.add('a'))
+            self.assertTrue(seen.add('b'))
+            self.assertTrue(seen.add('c'))
+            self.assertEqual(len(seen), 2)
+            self.assertTrue(seen.add('a'))
+        with mock.patch('posts.utils.view_dedupe.time.monotonic', return_value=161):
+            self.assertTrue(seen.add('c'))
+
+    @override_settings(POST_VIEW_BUFFER={'FLUSH_INTERVAL': 0})
+    def test_reloads_are_acknowledged_but_not_recorded(self):
+        view_buffer._buffer = None
+        self.addCleanup(setattr, view_buffer, '_buffer', None)
+        post = self.make_post()
+        login(self.client, make_user('reader'))
+
+        self.assertEqual(self.client.post(f'/api/posts/{post.id}/view/').status_code, 201)
+        response = self.client.post(f'/api/posts/{post.id}/view/')
+        self.assertEqual((response.status_code, response.json()['message']), (200, 'View already recorded'))
+        post.refresh_from_db()
+        self.assertEqual(post.view_count, 1)
+
+
+class ViewArchiveTests(TempStorageMixin, BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.now = timezone.now()
+        self.old_views = [
+            PostView.objects.create(post=self.post, ip_address='10.0.0.1', viewed_at=self.now - timedelta(days=days))
+            for days in (100, 100, 120)
+        ]
+        self.recent = PostView.objects.create(post=self.post, ip_address='10.0.0.2', viewed_at=self.now)
+
+    def test_old_views_move_to_the_archive_and_come_back(self):
+        cutoff = self.now - timedelta(days=90)
+        archived = sum(count for count, _ in archive_views_before(cutoff, chunk_size=2))
+        self.assertEqual(archived, 3)
+        self.assertEqual(list(PostView.objects.all()), [self.recent])
+
+        start, end = (self.now - timedelta(days=121)).date(), (self.now - timedelta(days=99)).date()
+        # S3 reports directory prefixes as missing; restoring must not rely on exists().
+        with mock.patch.object(type(default_storage._wrapped), 'exists', return_value=False):
+            self.assertEqual(restore_views(start, end), 3)
+        # Rows keep their ids, so restoring again adds nothing.
+        self.assertEqual(restore_views(start, end), 0)
+        self.assertEqual(
+            set(PostView.objects.values_list('id', flat=True)),
+            {view.id for view in self.old_views} | {self.recent.id},
+        )
+
+    def test_restore_counts_only_inserted_rows(self):
+        other = self.make_post('Other')
+        PostView.objects.create(post=other, ip_address='10.0.0.3', viewed_at=self.now - timedelta(days=100))
+        cutoff = self.now - timedelta(days=90)
+        list(archive_views_before(cutoff))
+        other.delete()
+        start, end = (self.now - timedelta(days=121)).date(), (self.now - timedelta(days=99)).date()
+        out = StringIO()
+        call_command('restore_post_views', str(start), str(end), stdout=out)
+        self.assertIn('Restored 3 archived post views.', out.getvalue())
+
+    def test_dry_run_keeps_rows(self):
+        archived = sum(count for count, _ in archive_views_before(self.now - timedelta(days=90), dry_run=True, chunk_size=1))
+        self.assertEqual(archived, 3)
+        self.assertEqual(PostView.objects.count(), 4)
+
+    def test_restore_rejects_reversed_range(self):
+        with self.assertRaises(CommandError):
+            call_command('restore_post_views', str(date(2024, 2, 1)), str(date(2024, 1, 1)))
+
+
+class LikeToggleTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.reader = make_user('reader')
+        login(self.client, self.reader)
+        self.url = f'/api/posts/{self.post.id}/like/'
+
+    def test_explicit_state_is_idempotent(self):
+        for _ in range(2):
+            data = self.client.post(self.url, {'like': True}).json()['data']
+            self.assertEqual((data['total_likes'], data['is_liked']), (1, True))
+        for _ in range(2):
+            data = self.client.post(self.url, {'like': False}).json()['data']
+            self.assertEqual((data['total_likes'], data['is_liked']), (0, False))
+        self.assertFalse(PostReaction.objects.exists())
+
+    def test_status_reads_counter_and_membership(self):
+        PostReaction.objects.create(user=self.reader, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(like_count=1)
+        self.client.get(self.url)  # Warms the user cache.
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url).json()['data']
+        self.assertEqual((data['total_likes'], data['is_liked']), (1, True))
+
+    def test_unknown_post_is_not_found_and_leaves_no_reaction(self):
+        url = f'/api/posts/{self.post.id + 1000}/like/'
+        self.assertEqual(self.client.post(url).status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertFalse(PostReaction.objects.exists())
+
+class LikeBatchTests(BlogTestCase):
+    url = '/api/posts/likes/'
+
+    def test_returns_counts_and_state_for_existing_posts(self):
+        liked, other = self.make_post('Liked'), self.make_post('Other')
+        reader = make_user('reader')
+        PostReaction.objects.create(user=reader, post=liked)
+        Post.objects.filter(pk=liked.pk).update(like_count=4)
+        login(self.client, reader)
+
+        data = self.client.get(self.url, {'ids': f'{liked.id},{other.id},{other.id + 1000}'}).json()['data']
+        self.assertEqual(data, {
+            str(liked.id): {'total_likes': 4, 'is_liked': True},
+            str(other.id): {'total_likes': 0, 'is_liked': False},
+        })
+
+    def test_rejects_bad_and_oversized_id_lists(self):
+        login(self.client, make_user('reader'))
+        self.assertEqual(self.client.get(self.url, {'ids': '1,two'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'ids': ','.join(map(str, range(201)))}).status_code, 400)
+
+
+class SearchTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.in_title = self.make_post('Django caching guide', content='<p>How to make pages fast.</p>')
+        self.in_body = self.make_post('Weekly notes', content='<p>We looked at <b>django</b> signals.</p>')
+        self.unrelated = self.make_post('Gardening', content='<p>Tomatoes and basil.</p>')
+
+    def search(self, query, category_id=None):
+        return [row['post_id'] for row in ranked_post_ids(query, category_id)]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search('Django'), [self.in_title.id, self.in_body.id])
+
+    def test_index_follows_edits_drafts_and_deletes(self):
+        self.in_body.content = '<p>Nothing relevant.</p>'
+        self.in_body.save()
+        self.assertEqual(self.search('django'), [self.in_title.id])
+
+        self.in_title.is_draft = True
+        self.in_title.save()
+        self.assertEqual(self.search('django'), [])
+
+        self.unrelated.delete()
+        self.assertEqual(self.search('tomatoes'), [])
+
+    def test_category_filter(self):
+        other = Category.objects.create(name='Other', description='Other posts')
+        Post.objects.filter(pk=self.in_body.pk).update(category=other)
+        self.assertEqual(self.search('django', category_id=other.id), [self.in_body.id])
+
+    def test_queries_without_indexed_terms_match_nothing(self):
+        self.assertEqual(tokenize('The and of'), [])
+        self.assertEqual(self.search('the and of'), [])
+        self.assertEqual(self.search('kubernetes'), [])
+
+    def test_post_list_page_searches(self):
+        login(self.client, make_user('reader'))
+        response = self.client.get('/post-list/', {'search': 'django'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([post.id for post in response.context['posts']], [self.in_title.id, self.in_body.id])
+
+
+class ExcerptTests(BlogTestCase):
+    def test_excerpt_is_plain_text_prefix_of_content(self):
+        post = self.make_post(content='<h2>Intro</h2><p>Hello &amp; <b>welcome</b></p>' + '<p>word </p>' * 200)
+        self.assertTrue(post.excerpt.startswith('Intro Hello & welcome word'))
+        self.assertEqual(len(post.excerpt), Post.EXCERPT_LENGTH + 1)
+
+    def test_excerpt_follows_content_updates(self):
+        post = self.make_post(content='<p>Old</p>')
+        post.content = '<p>New</p>'
+        post.save(update_fields=['content'])
+        self.assertEqual(Post.objects.get(pk=post.pk).excerpt, 'New')
+
+    def test_saving_without_content_keeps_excerpt(self):
+        post = self.make_post(content='<p>Kept</p>')
+        card = Post.objects.for_card().get(pk=post.pk)
+        card.title = 'Renamed'
+        card.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).excerpt, 'Kept')
+
+
+class TrendingTests(BlogTestCase):
+    def setUp(self):
+        super().setUp()
+        self.old = self.make_post('Old')
+        self.hot = self.make_post('Hot')
+        self.new = self.make_post('New')
+
+    def test_records_create_then_update_scores(self):
+        earlier = timezone.now() - timedelta(hours=1)
+        record_trending_events([(self.old.id, 'view', 2)], when=earlier)
+        first = PostTrendingScore.objects.get(pk=self.old.id)
+        record_trending_events([(self.old.id, 'like', 1)])
+        second = PostTrendingScore.objects.get(pk=self.old.id)
+        self.assertGreater(second.score, first.score)
+        self.assertGreater(second.updated_at, earlier)
+
+    def test_ignores_events_without_weight(self):
+        with self.assertNumQueries(0):
+            record_trending_events([(self.old.id, 'view', 0)])
+        self.assertFalse(PostTrendingScore.objects.exists())
+
+    def test_recent_engagement_outranks_older_engagement(self):
+        record_trending_events([(self.old.id, 'comment', 3)], when=timezone.now() - timedelta(days=3))
+        record_trending_events([(self.hot.id, 'view', 5)])
+        self.assertEqual([post.id for post in Post.objects.top_trending(2)], [self.hot.id, self.old.id])
+
+    def test_top_trending_skips_drafts_and_fills_with_recent_posts(self):
+        draft = self.make_post('Draft', is_draft=True)
+        record_trending_events([(draft.id, 'like', 10), (self.old.id, 'view', 1)])
+        self.assertEqual([post.id for post in Post.objects.top_trending(3)], [self.old.id, self.new.id, self.hot.id])
+
+    def test_like_endpoint_records_a_like(self):
+        login(self.client, make_user('reader'))
+        self.client.post(f'/api/posts/{self.hot.id}/like/')
+        self.assertTrue(PostTrendingScore.objects.filter(pk=self.hot.id).exists())
+
+    def test_retries_when_a_concurrent_writer_creates_the_row(self):
+        original = PostTrendingScore.objects.bulk_create
+        calls = []
+
+        def bulk_create(objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 1:
+                raise IntegrityError('duplicate key')
+            return original(objs, *args, **kwargs)
+
+        with mock.patch.object(PostTrendingScore.objects, 'bulk_create', side_effect=bulk_create):
+            record_trending_events([(self.old.id, 'view', 1)])
+        self.assertEqual(calls, [1, 1])
+        self.assertTrue(PostTrendingScore.objects.filter(pk=self.old.id).exists())
+
+    def test_gives_up_after_repeated_conflicts(self):
+        with mock.patch.object(PostTrendingScore.objects, 'bulk_create', side_effect=IntegrityError('duplicate key')):
+            with self.assertRaises(IntegrityError):
+                record_trending_events([(self.old.id, 'view', 1)])
+
+    def test_rebuild_recomputes_from_engagement(self):
+        record_trending_events([(self.new.id, 'view', 1)])
+        PostView.objects.create(post=self.old, ip_address='10.0.0.1')
+        PostReaction.objects.create(post=self.hot, user=make_user('reader'))
+        self.assertEqual(rebuild_trending_scores(), 2)
+        self.assertEqual(
+            set(PostTrendingScore.objects.values_list('post_id', flat=True)), {self.old.id, self.hot.id}
+        )
+        self.assertGreater(
+            PostTrendingScore.objects.get(pk=self.hot.id).score, PostTrendingScore.objects.get(pk=self.old.id).score
+        )
+
+    def test_rebuild_command_reports_count(self):
+        PostView.objects.create(post=self.old, ip_address='10.0.0.1')
+        out = StringIO()
+        call_command('rebuild_trending_scores', days=1, stdout=out)
+        self.assertIn('Rebuilt trending scores for 1 posts.', out.getvalue())
+
+
+class CommentListTests(BlogTestCase):
+    url = '/api/posts/comments/'
+
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post()
+        self.reader = make_user('reader')
+        other = make_user('other')
+        self.approved = [Comment.objects.create(post=self.post, user=other, content=f'Hi {i}', is_approved=True) for i in range(3)]
+        self.own_pending = Comment.objects.create(post=self.post, user=self.reader, content='Mine')
+        Comment.objects.create(post=self.post, user=other, content='Hidden')
+        Comment.objects.create(post=self.make_post('Elsewhere'), user=other, content='Other post', is_approved=True)
+        recount_post_counters()
+        login(self.client, self.reader)
+
+    def test_lists_approved_and_own_comments_newest_first(self):
+        response = self.client.get(self.url, {'post': self.post.id, 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Total-Count'], '3')
+        first = response.json()['data']
+        self.assertTrue(first['has_next'])
+        second = self.client.get(first['next']).json()['data']
+        self.assertFalse(second['has_next'])
+        expected = [self.own_pending.id] + [comment.id for comment in reversed(self.approved)]
+        self.assertEqual([comment['id'] for comment in first['results'] + second['results']], expected)
+
+    def test_non_numeric_post_returns_an_empty_page(self):
+        response = self.client.get(self.url, {'post': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['results'], [])
+        self.assertNotIn('X-Total-Count', response)
+
+    def test_requires_authentication(self):
+        self.client.cookies.clear()
+        self.assertEqual(self.client.get(self.url, {'post': self.post.id}).status_code, 401)
+
+
+class BulkPostActionTests(BlogTestCase):
+    url = '/api/posts/post/bulk/'
+
+    def setUp(self):
+        super().setUp()
+        self.live = self.make_post('Live django')
+        self.drafts = [self.make_post(f'Draft django {i}', is_draft=True) for i in range(2)]
+        login(self.client, self.author)
+
+    def _post(self, **body):
+        return self.client.post(self.url, body, content_type='application/json')
+
+    def test_dry_run_reports_without_changing(self):
+        ids = [post.id for post in self.drafts] + [self.live.id, 999999]
+        data = self._post(action='publish', ids=ids, dry_run=True).json()['data']
+        self.assertEqual((data['matched'], data['affected']), (3, 2))
+        self.assertEqual(data['results'][str(self.live.id)], 'unchanged')
+        self.assertEqual(data['results']['999999'], 'not_found')
+        self.assertEqual(Post.objects.filter(is_draft=True).count(), 2)
+
+    def test_publish_by_filter_indexes_and_counts(self):
+        get_site_stats()
+        data = self._post(action='publish', filter={'is_draft': True}).json()['data']
+        self.assertEqual(data['affected'], 2)
+        self.assertFalse(Post.objects.filter(is_draft=True).exists())
+        self.assertEqual(len(ranked_post_ids('django')), 3)
+        self.assertEqual(get_site_stats()['total_posts'], 3)
+
+    def test_unpublish_removes_from_search(self):
+        self._post(action='unpublish', ids=[self.live.id])
+        self.assertTrue(Post.objects.get(pk=self.live.pk).is_draft)
+        self.assertEqual(list(ranked_post_ids('django')), [])
+
+    def test_change_category_and_delete(self):
+        other = Category.objects.create(name='Life', description='Life posts')
+        data = self._post(action='change_category', category_id=other.id, filter={'author': self.author.id}).json()['data']
+        self.assertEqual(data['affected'], 3)
+        self.assertEqual(set(Post.objects.values_list('category_id', flat=True)), {other.id})
+
+        data = self._post(action='delete', ids=[self.live.id]).json()['data']
+        self.assertEqual(data['results'], {str(self.live.id): 'deleted'})
+        self.assertFalse(Post.objects.filter(pk=self.live.pk).exists())
+
+    def test_invalid_requests_are_rejected(self):
+        bodies = [
+            {'action': 'publish'},
+            {'action': 'publish', 'ids': [self.live.id], 'filter': {'is_draft': True}},
+            {'action': 'change_category', 'ids': [self.live.id]},
+            {'action': 'change_category', 'ids': [self.live.id], 'category_id': 999999},
+            {'action': 'archive', 'ids': [self.live.id]},
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                self.assertEqual(self._post(**body).status_code, 400)
+        self.assertEqual(Post.objects.filter(is_draft=True).count(), 2)
+
+    def test_readers_cannot_bulk_edit(self):
+        login(self.client, make_user('reader'))
+        self.assertEqual(self._post(action='delete', ids=[self.live.id]).status_code, 403)
+
+
+def image_file(width, height, name='cover.png'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'teal').save(buffer, 'PNG')
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+class CoverVariantTests(TempStorageMixin, BlogTestCase):
+    def _variant_names(self, post):
+        return [entry['name'] for entries in post.cover_variants['formats'].values() for entry in entries]
+
+    def test_upload_generates_variants_up_to_the_original_width(self):
+        post = self.make_post(cover_image=image_file(800, 400))
+        post.refresh_from_db()
+        self.assertEqual(post.cover_variants['source'], post.cover_image.name)
+        self.assertEqual([entry['size'] for entry in post.cover_variants['formats']['webp']], ['thumb', 'card'])
+        self.assertEqual(post.cover_variants['formats']['jpeg'][0]['height'], 160)
+        self.assertTrue(post.cover_variants['placeholder'].startswith('data:image/jpeg;base64,'))
+        for name in self._variant_names(post):
+            self.assertTrue(default_storage.exists(name), name)
+
+    def test_small_images_still_get_one_variant(self):
+        post = self.make_post(cover_image=image_file(100, 50))
+        post.refresh_from_db()
+        self.assertEqual([(entry['size'], entry['width']) for entry in post.cover_variants['formats']['jpeg']], [('thumb', 100)])
+
+    def test_replacing_and_clearing_the_cover_removes_old_variants(self):
+        post = self.make_post(cover_image=image_file(400, 200))
+        old_names = self._variant_names(post)
+        post.cover_image = image_file(400, 200, name='other.png')
+        post.save()
+        self.assertTrue(all(not default_storage.exists(name) for name in old_names))
+        new_names = self._variant_names(post)
+        post.cover_image = None
+        post.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).cover_variants, {})
+        self.assertTrue(all(not default_storage.exists(name) for name in new_names))
+
+    def test_deleting_the_post_removes_variants(self):
+        post = self.make_post(cover_image=image_file(400, 200))
+        names = self._variant_names(post)
+        post.delete()
+        self.assertTrue(all(not default_storage.exists(name) for name in names))
+
+    def test_cover_picture_renders_srcsets(self):
+        post = self.make_post(cover_image=image_file(800, 400))
+        html = cover_picture(Post.objects.get(pk=post.pk), sizes='50vw', alt='Cover')
+        self.assertIn('<source type="image/webp" srcset="', html)
+        self.assertIn(' 320w, ', html)
+        self.assertIn('sizes="50vw" width="800" height="400"', html)
+
+    def test_undecodable_upload_falls_back_to_the_original(self):
+        with self.assertLogs('posts', 'ERROR'):
+            post = self.make_post(cover_image=ContentFile(b'not an image', name='broken.png'))
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.cover_variants, {'source': post.cover_image.name})
+        html = cover_picture(post, alt='Cover')
+        self.assertTrue(html.startswith(f'<img src="{post.cover_image.url}"'))
+
+    def test_command_backfills_missing_variants(self):
+        post = self.make_post(cover_image=image_file(400, 200))
+        Post.objects.filter(pk=post.pk).update(cover_variants={})
+        out = StringIO()
+        call_command('generate_cover_variants', stdout=out)
+        self.assertIn('Generated variants for 1 posts (0 failed).', out.getvalue())
+        self.assertEqual(Post.objects.get(pk=post.pk).cover_variants['source'], post.cover_image.name)
+
+
+class ChunkedUploadTests(TempStorageMixin, BlogTestCase):
+    url = '/api/posts/uploads/'
+    payload = b'%PDF-1.4 0123456789'
+
+    def setUp(self):
+        super().setUp()
+        self.staging_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.staging_dir, ignore_errors=True)
+        self.enterContext(override_settings(ATTACHMENT_UPLOADS={
+            **settings.ATTACHMENT_UPLOADS, 'STAGING_DIR': self.staging_dir, 'CHUNK_SIZE': 8, 'MAX_SIZE': 1024,
+        }))
+        self.post = self.make_post()
+        login(self.client, self.author)
+
+    def _start(self, **fields):
+        body = {'post_id': self.post.id, 'filename': 'C:\\docs\\guide.pdf', 'content_type': 'application/pdf', 'size': len(self.payload)}
+        return self.client.post(self.url, {**body, **fields}, content_type='application/json')
+
+    def _put(self, upload_id, index, data):
+        return self.client.put(f'{self.url}{upload_id}/chunks/{index}/', data, content_type='application/octet-stream')
+
+    def test_upload_resume_and_complete(self):
+        started = self._start().json()['data']
+        self.assertEqual((started['filename'], started['chunk_size'], started['total_chunks']), ('guide.pdf', 8, 3))
+        upload_id = started['id']
+
+        self.assertEqual(self._put(upload_id, 2, self.payload[16:]).json()['data'], {'index': 2, 'size': 3})
+        self.assertEqual(self._put(upload_id, 0, self.payload[:8]).status_code, 200)
+        state = self.client.get(f'{self.url}{upload_id}/').json()['data']
+        self.assertEqual(state['received_chunks'], [0, 2])
+
+        incomplete = self.client.post(f'{self.url}{upload_id}/complete/')
+        self.assertEqual(incomplete.status_code, 400)
+        self.assertEqual(incomplete.json()['error'], {'missing_chunks': [1]})
+
+        self._put(upload_id, 1, self.payload[8:16])
+        response = self.client.post(f'{self.url}{upload_id}/complete/')
+        self.assertEqual(response.status_code, 200, response.content)
+        post = Post.objects.get(pk=self.post.pk)
+        with post.attachment.open('rb') as attachment:
+            self.assertEqual(attachment.read(), self.payload)
+        self.assertFalse(AttachmentUpload.objects.exists())
+        self.assertEqual(os.listdir(self.staging_dir), [])
+
+    def test_only_one_request_completes_an_upload(self):
+        upload_id = self._start(size=8).json()['data']['id']
+        self._put(upload_id, 0, self.payload[:8])
+        AttachmentUpload.objects.filter(pk=upload_id).update(status=AttachmentUpload.STATUS_COMPLETING)
+        self.assertEqual(self.client.post(f'{self.url}{upload_id}/complete/').status_code, 409)
+        self.assertEqual(self._put(upload_id, 0, self.payload[:8]).status_code, 409)
+        self.assertFalse(Post.objects.get(pk=self.post.pk).attachment)
+
+    def test_failed_assembly_can_be_retried(self):
+        upload_id = self._start(size=8).json()['data']['id']
+        self._put(upload_id, 0, self.payload[:8])
+        with mock.patch.object(chunked_upload, 'assembled_file', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                self.client.post(f'{self.url}{upload_id}/complete/')
+        self.assertEqual(AttachmentUpload.objects.get(pk=upload_id).status, AttachmentUpload.STATUS_UPLOADING)
+        self.assertEqual(self.client.post(f'{self.url}{upload_id}/complete/').status_code, 200)
+
+    def test_rejects_chunks_of_the_wrong_size_or_index(self):
+        upload_id = self._start().json()['data']['id']
+        for index, data in ((0, self.payload[:7]), (0, self.payload[:9]), (2, self.payload[16:18]), (3, b'x')):
+            with self.subTest(index=index, size=len(data)):
+                self.assertEqual(self._put(upload_id, index, data).status_code, 400)
+        self.assertEqual(os.listdir(os.path.join(self.staging_dir, upload_id)), [])
+
+    def test_rejects_invalid_uploads(self):
+        for fields in ({'size': 0}, {'size': 2048}, {'content_type': 'application/x-msdownload'}, {'post_id': 999999}):
+            with self.subTest(fields=fields):
+                self.assertEqual(self._start(**fields).status_code, 400)
+
+    def test_uploads_are_private_to_their_creator(self):
+        upload_id = self._start().json()['data']['id']
+        login(self.client, make_user('editor', is_staff=True))
+        self.assertEqual(self.client.get(f'{self.url}{upload_id}/').status_code, 404)
+        self.assertEqual(self._put(upload_id, 0, self.payload[:8]).status_code, 404)
+
+    def test_cancel_discards_staged_chunks(self):
+        upload_id = self._start().json()['data']['id']
+        self._put(upload_id, 0, self.payload[:8])
+        self.assertEqual(self.client.delete(f'{self.url}{upload_id}/').status_code, 200)
+        self.assertFalse(AttachmentUpload.objects.exists())
+        self.assertFalse(os.path.exists(os.path.join(self.staging_dir, upload_id)))
+
+    def test_prune_drops_only_stalled_uploads(self):
+        stalled = self._start().json()['data']['id']
+        active = self._start().json()['data']['id']
+        self._put(stalled, 0, self.payload[:8])
+        AttachmentUpload.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+        self._put(active, 0, self.payload[:8])
+        out = StringIO()
+        call_command('prune_attachment_uploads', hours=1, stdout=out)
+        self.assertIn('Pruned 1 unfinished uploads.', out.getvalue())
+        self.assertEqual([str(pk) for pk in AttachmentUpload.objects.values_list('pk', flat=True)], [active])
+        self.assertFalse(os.path.exists(os.path.join(self.staging_dir, stalled)))
+        self.assertEqual(chunked_upload.received_chunks(AttachmentUpload.objects.get()), [0])
+
+
+def zip_bytes(*names):
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name in names:
+            archive.writestr(name, 'x')
+    return buffer.getvalue()
+
+
+class AttachmentMetadataTests(TempStorageMixin, BlogTestCase):
+    def test_sniffs_types_from_content(self):
+        cases = [
+            (b'%PDF-1.7 body', 'report.bin', 'application/pdf'),
+            (b'\x89PNG\r\n\x1a\nrest', 'photo.jpg', 'image/png'),
+            (b'RIFF\x00\x00\x00\x00WEBPVP8 ', 'x', 'image/webp'),
+            (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1rest', 'sheet.xls', 'application/vnd.ms-excel'),
+            ('naïve text'.encode()[:7], 'notes', 'text/plain'),
+            (b'\x00\x01\x02binary', 'data.mp3', 'audio/mpeg'),
+            (b'\x00\x01\x02binary', 'data', 'application/octet-stream'),
+        ]
+        for head, filename, expected in cases:
+            with self.subTest(filename=filename, expected=expected):
+                self.assertEqual(sniff_mime_type(head, filename), expected)
+
+    def test_tells_office_documents_from_plain_zips(self):
+        docx = zip_bytes('[Content_Types].xml', 'word/document.xml')
+        self.assertEqual(
+            inspect_file(BytesIO(docx), 'a.zip')['mime_type'],
+            'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+        )
+        self.assertEqual(inspect_file(BytesIO(zip_bytes('readme.txt')), 'a.docx')['mime_type'], 'application/zip')
+        self.assertEqual(inspect_file(BytesIO(b'PK\x03\x04broken'), 'a.docx')['mime_type'], 'application/zip')
+
+    def test_inspect_reports_size_and_digest_and_rewinds(self):
+        data = b'%PDF-' + b'x' * 200000
+        fileobj = BytesIO(data)
+        metadata = inspect_file(fileobj, 'big.pdf')
+        self.assertEqual(metadata, {'size': len(data), 'sha256': hashlib.sha256(data).hexdigest(), 'mime_type': 'application/pdf'})
+        self.assertEqual(fileobj.tell(), 0)
+
+    def test_saving_a_new_attachment_records_metadata(self):
+        post = self.make_post(attachment=ContentFile(b'%PDF-1.4 guide', name='Guide.pdf'))
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual(post.attachment_name, 'Guide.pdf')
+        self.assertEqual(post.attachment_size, 14)
+        self.assertEqual(post.get_attachment_type, 'application/pdf')
+        self.assertEqual(post.attachment_sha256, hashlib.sha256(b'%PDF-1.4 guide').hexdigest())
+
+        post.title = 'Renamed'
+        post.save()
+        self.assertEqual(Post.objects.get(pk=post.pk).attachment_file_size, 14)
+
+    def test_removing_the_attachment_clears_metadata(self):
+        post = self.make_post(attachment=ContentFile(b'hello', name='hello.txt'))
+        post.attachment = None
+        post.save(update_fields=['attachment'])
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual((post.attachment_original_name, post.attachment_file_size, post.attachment_sha256), ('', None, ''))
+
+    def test_backfill_command_fills_missing_metadata(self):
+        post = self.make_post(attachment=ContentFile(b'%PDF-1.4 old', name='old.pdf'))
+        Post.objects.filter(pk=post.pk).update(attachment_file_size=None, attachment_mime_type='', attachment_sha256='')
+        out = StringIO()
+        call_command('backfill_attachment_metadata', workers=2, stdout=out)
+        self.assertIn('Recorded metadata for 1 attachments (0 failed).', out.getvalue())
+        post = Post.objects.get(pk=post.pk)
+        self.assertEqual((post.attachment_file_size, post.attachment_mime_type), (12, 'application/pdf'))
+
+    def test_backfill_command_reports_missing_files(self):
+        post = self.make_post(attachment=ContentFile(b'gone', name='gone.txt'))
+        Post.objects.filter(pk=post.pk).update(attachment_sha256='')
+        default_storage.delete(post.attachment.name)
+        out, err = StringIO(), StringIO()
+        call_command('backfill_attachment_metadata', stdout=out, stderr=err)
+        self.assertIn('(1 failed)', out.getvalue())
+        self.assertIn(f'Post {post.pk}:', err.getvalue())
+
+
+class AttachmentDownloadTests(TempStorageMixin, BlogTestCase):
+    data = b'%PDF-1.4 ' + bytes(range(256)) * 4
+
+    def setUp(self):
+        super().setUp()
+        self.post = self.make_post(attachment=ContentFile(self.data, name='Guide.pdf'))
+        self.url = f'/api/posts/{self.post.id}/attachment/'
+        login(self.client, make_user('reader'))
+
+    def _content(self, response):
+        return b''.join(response.streaming_content)
+
+    def _downloads(self):
+        return Post.objects.get(pk=self.post.pk).attachment_download_count
+
+    def test_parse_range(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 100))
+        self.assertEqual(parse_range('bytes=10-', 100), (10, 99))
+        self.assertEqual(parse_range('bytes=90-500', 100), (90, 99))
+        self.assertEqual(parse_range('bytes=-500', 100), (0, 99))
+        for header in ('bytes=100-', 'bytes=5-4', 'bytes=-0'):
+            with self.subTest(header=header), self.assertRaises(RangeNotSatisfiable):
+                parse_range(header, 100)
+
+    def test_streams_the_whole_file(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/pdf')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._content(response), self.data)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(response['ETag'], f'"{hashlib.sha256(self.data).hexdigest()}"')
+        self.assertIn('attachment; filename="Guide.pdf"', response['Content-Disposition'])
+        self.assertEqual(self._downloads(), 1)
+
+    def test_head_requests_are_not_downloads(self):
+        response = self.client.head(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(self.data)))
+        self.assertEqual(self._downloads(), 0)
+
+    def test_empty_files(self):
+        post = self.make_post(attachment=ContentFile(b'', name='Empty.pdf'))
+        url = f'/api/posts/{post.id}/attachment/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._content(response), b'')
+        self.assertEqual(response['Content-Length'], '0')
+        self.assertEqual(Post.objects.get(pk=post.pk).attachment_download_count, 1)
+        self.assertEqual(self.client.get(url, HTTP_RANGE='bytes=-5').status_code, 416)
+
+        # No Range header is sent to S3 for an empty file.
+        s3 = mock.Mock(spec=['bucket', 'bucket_name', '_normalize_name'])
+        self.assertEqual(list(iter_file_range(s3, 'Empty.pdf', 0, -1)), [])
+        s3.bucket.Object.assert_not_called()
+
+    def test_ranges_and_resumes(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=9-12')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self._content(response), self.data[9:13])
+        self.assertEqual(response['Content-Range'], f'bytes 9-12/{len(self.data)}')
+        self.assertEqual(self._downloads(), 0)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-3')
+        self.assertEqual(self._content(response), b'%PDF')
+        self.assertEqual(self._downloads(), 1)
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.data)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.data)}')
+
+    def test_conditional_requests(self):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"other", {etag}').status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=etag).status_code, 206)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE='"stale"').status_code, 200)
+
+    def test_weak_etags_never_satisfy_if_range(self):
+        Post.objects.filter(pk=self.post.pk).update(attachment_sha256='')
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=etag).status_code, 200)
+        last_modified = response['Last-Modified']
+        self.assertEqual(self.client.get(self.url, HTTP_RANGE='bytes=0-3', HTTP_IF_RANGE=last_modified).status_code, 206)
+
+    def test_missing_and_draft_attachments(self):
+        Post.objects.filter(pk=self.post.pk).update(is_draft=True)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        login(self.client, self.author)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.client.get(f'/api/posts/{self.make_post().id}/attachment/').status_code, 404)
@@ -0,0 +1,105 @@
+"""
+Staging storage for chunked attachment uploads.
+
+Each AttachmentUpload gets a directory under ATTACHMENT_UPLOADS['STAGING_DIR']
+holding one `<index>.part` file per received chunk. Chunks are streamed
+from the request to disk in small blocks and renamed into place only once
+complete, so the set of part files is always the set of chunks a client
+can skip when resuming. Completing an upload concatenates the parts into
+one staged file and hands it to the attachment field's storage, which
+streams it on to the configured backend.
+"""
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class ChunkError(Exception):
+    pass
+
+
+def upload_settings():
+    return settings.ATTACHMENT_UPLOADS
+
+
+def staging_dir(upload):
+    return os.path.join(upload_settings()['STAGING_DIR'], str(upload.pk))
+
+
+def _chunk_path(upload, index):
+    return os.path.join(staging_dir(upload), f'{index}.part')
+
+
+def received_chunks(upload):
+    try:
+        names = os.listdir(staging_dir(upload))
+    except FileNotFoundError:
+        return []
+    return sorted(int(name[:-5]) for name in names if name.endswith('.part'))
+
+
+def missing_chunks(upload):
+    received = set(received_chunks(upload))
+    return [index for index in range(upload.total_chunks) if index not in received]
+
+
+def write_chunk(upload, index, stream):
+    """
+    Copy one chunk from a file-like request stream into the staging
+    directory. Re-sending a chunk replaces it, which makes retries safe.
+    Each accepted chunk refreshes the upload's updated_at, so uploads are
+    only pruned once they stop making progress.
+    """
+    if not 0 <= index < upload.total_chunks:
+        raise ChunkError(f'Chunk index must be between 0 and {upload.total_chunks - 1}.')
+    expected = upload.chunk_length(index)
+    os.makedirs(staging_dir(upload), exist_ok=True)
+    path = _chunk_path(upload, index)
+    # A unique name per attempt: concurrent retries of a chunk must not share a partial file.
+    destination = tempfile.NamedTemporaryFile(dir=staging_dir(upload), prefix=f'{index}.', suffix='.tmp', delete=False)
+    partial = destination.name
+    written = 0
+    try:
+        with destination:
+            while written <= expected:
+                block = stream.read(min(READ_BLOCK_SIZE, expected + 1 - written))
+                if not block:
+                    break
+                destination.write(block)
+                written += len(block)
+        if written != expected:
+            raise ChunkError(f'Chunk {index} must be {expected} bytes, received {written}.')
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    type(upload).objects.filter(pk=upload.pk).update(updated_at=timezone.now())
+    return written
+
+
+@contextmanager
+def assembled_file(upload):
+    """Yield the complete upload as a django File backed by a staged temp file."""
+    missing = missing_chunks(upload)
+    if missing:
+        raise ChunkError(f'{len(missing)} chunks are missing.')
+    path = os.path.join(staging_dir(upload), 'assembled')
+    with open(path, 'wb') as destination:
+        for index in range(upload.total_chunks):
+            with open(_chunk_path(upload, index), 'rb') as part:
+                shutil.copyfileobj(part, destination, READ_BLOCK_SIZE)
+    try:
+        with open(path, 'rb') as assembled:
+            yield File(assembled, name=upload.filename)
+    finally:
+        os.remove(path)
+
+
+def discard(upload):
+    shutil.rmtree(staging_dir(upload), ignore_errors=True)
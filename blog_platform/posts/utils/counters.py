@@ -0,0 +1,45 @@
+from django.db.models import F, Count, Subquery, OuterRef, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def bump_post_counters(post_id, **deltas):
+    """
+    Apply relative changes to the denormalized counters of a post in one UPDATE,
+    e.g. bump_post_counters(post.id, like_count=1).
+    Returns the number of posts updated (0 if the post does not exist).
+    """
+    from ..models import Post
+
+    changes = {
+        field: Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items() if delta
+    }
+    if not changes:
+        return 0
+    return Post.objects.filter(pk=post_id).update(**changes)
+
+
+def recount_post_counters(post_ids=None):
+    """
+    Recompute the denormalized counters from the source tables.
+    Used for backfills and to repair drift after bulk changes.
+    """
+    from ..models import Post, PostReaction, Comment
+
+    def _count(model, **filters):
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk'), **filters)
+            .order_by()
+            .values('post')
+            .annotate(total=Count('id'))
+            .values('total')[:1]
+        ), 0)
+
+    posts = Post.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=post_ids)
+    return posts.update(
+        like_count=_count(PostReaction),
+        comment_count=_count(Comment),
+        approved_comment_count=_count(Comment, is_approved=True),
+    )
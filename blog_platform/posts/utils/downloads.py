@@ -0,0 +1,95 @@
+"""
+Helpers for serving post attachments through the application.
+
+Files are streamed from the storage backend in fixed-size blocks, honoring
+a single HTTP byte range. With S3 storage the range is requested from S3
+directly, so neither whole files nor their unread prefixes pass through
+the worker. Alternatively, a short-lived presigned URL can be handed out
+and the client redirected to it.
+"""
+import re
+from django.conf import settings
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def download_settings():
+    return settings.ATTACHMENT_DOWNLOADS
+
+
+def parse_range(header, size):
+    """
+    (start, end) inclusive byte offsets for a Range header, or None to send
+    the whole file. Multiple ranges and malformed headers are ignored, as
+    RFC 9110 allows; ranges outside the file raise RangeNotSatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if size == 0:
+        raise RangeNotSatisfiable()
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+def _is_s3(storage):
+    return hasattr(storage, 'bucket') and hasattr(storage, 'bucket_name')
+
+
+def iter_file_range(storage, name, start, end, chunk_size=None):
+    """Yield bytes start..end (inclusive) of a stored file in chunk_size blocks."""
+    chunk_size = chunk_size or download_settings()['CHUNK_SIZE']
+    if end < start:
+        # Empty file; there is no byte range to ask S3 for.
+        return
+    if _is_s3(storage):
+        key = storage._normalize_name(name)
+        body = storage.bucket.Object(key).get(Range=f'bytes={start}-{end}')['Body']
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+        return
+
+    remaining = end - start + 1
+    with storage.open(name, 'rb') as stored:
+        stored.seek(start)
+        while remaining > 0:
+            block = stored.read(min(chunk_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def presigned_url(storage, name, filename, expires=None):
+    """
+    A time-limited direct download URL, or None when the storage backend
+    cannot sign URLs (e.g. local filesystem storage).
+    """
+    if not _is_s3(storage):
+        return None
+    expires = expires or download_settings()['PRESIGNED_URL_EXPIRY']
+    return storage.bucket.meta.client.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': storage.bucket_name,
+            'Key': storage._normalize_name(name),
+            'ResponseContentDisposition': content_disposition_header(as_attachment=True, filename=filename),
+        },
+        ExpiresIn=expires,
+    )
@@ -0,0 +1,104 @@
+"""
+Attachment metadata recorded at upload time.
+
+inspect_file() streams a file once to get its size, SHA-256 and a MIME
+type sniffed from the leading bytes, so pages and API responses can read
+the stored values instead of asking the storage backend.
+"""
+import codecs
+import hashlib
+import mimetypes
+import posixpath
+import zipfile
+
+READ_BLOCK_SIZE = 64 * 1024
+SNIFF_LENGTH = 512
+DEFAULT_MIME_TYPE = 'application/octet-stream'
+
+# (offset, signature, mime type); checked in order.
+SIGNATURES = [
+    (0, b'%PDF-', 'application/pdf'),
+    (0, b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (0, b'\xff\xd8\xff', 'image/jpeg'),
+    (0, b'GIF87a', 'image/gif'),
+    (0, b'GIF89a', 'image/gif'),
+    (0, b'Rar!\x1a\x07', 'application/x-rar-compressed'),
+    (0, b'ID3', 'audio/mpeg'),
+    (4, b'ftyp', 'video/mp4'),
+]
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+OLE_TYPES = {
+    '.doc': 'application/msword',
+    '.xls': 'application/vnd.ms-excel',
+    '.ppt': 'application/vnd.ms-powerpoint',
+}
+OOXML_TYPES = {
+    'word/': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'xl/': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'ppt/': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+}
+
+
+def _zip_mime_type(fileobj):
+    """Office Open XML documents are zip files; tell them apart by their top-level folder."""
+    try:
+        fileobj.seek(0)
+        names = zipfile.ZipFile(fileobj).namelist()
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return 'application/zip'
+    for prefix, mime_type in OOXML_TYPES.items():
+        if any(name.startswith(prefix) for name in names):
+            return mime_type
+    return 'application/zip'
+
+
+def sniff_mime_type(head, filename, fileobj=None):
+    """
+    MIME type from the first bytes of a file. The extension is only used to
+    name OLE2 (legacy Office) files and when the content is unrecognized.
+    """
+    for offset, signature, mime_type in SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return mime_type
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+        return 'audio/wav'
+    if head[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return 'audio/mpeg'
+
+    extension = posixpath.splitext(filename)[1].lower()
+    if head.startswith(OLE_SIGNATURE):
+        return OLE_TYPES.get(extension, DEFAULT_MIME_TYPE)
+    if head.startswith(b'PK\x03\x04'):
+        return _zip_mime_type(fileobj) if fileobj is not None and fileobj.seekable() else 'application/zip'
+    if head and b'\x00' not in head:
+        try:
+            # Incremental decoding tolerates a character cut off at the end of `head`.
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+        except UnicodeDecodeError:
+            pass
+        else:
+            return 'text/plain'
+    return mimetypes.guess_type(filename)[0] or DEFAULT_MIME_TYPE
+
+
+def inspect_file(fileobj, filename):
+    """
+    {'size', 'sha256', 'mime_type'} of a readable file object. The object is
+    rewound before and after reading when it supports seeking.
+    """
+    if fileobj.seekable():
+        fileobj.seek(0)
+    digest = hashlib.sha256()
+    size = 0
+    head = b''
+    for block in iter(lambda: fileobj.read(READ_BLOCK_SIZE), b''):
+        if len(head) < SNIFF_LENGTH:
+            head += block[:SNIFF_LENGTH - len(head)]
+        digest.update(block)
+        size += len(block)
+    mime_type = sniff_mime_type(head, filename, fileobj)
+    if fileobj.seekable():
+        fileobj.seek(0)
+    return {'size': size, 'sha256': digest.hexdigest(), 'mime_type': mime_type}
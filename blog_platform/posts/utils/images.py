@@ -0,0 +1,116 @@
+"""
+Responsive variants of post cover images.
+
+When a cover image is uploaded, resized copies are written next to it on
+the same storage backend (thumb/card/hero widths, each as WebP and JPEG),
+plus a tiny inline placeholder. The storage names are recorded on
+Post.cover_variants so templates and the API can build srcset attributes
+without opening the original again.
+"""
+import base64
+import posixpath
+from io import BytesIO
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = {
+    'thumb': 320,
+    'card': 640,
+    'hero': 1280,
+}
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+PLACEHOLDER_WIDTH = 16
+VARIANT_DIR = 'variants'
+
+
+def _variant_name(source_name, label, extension):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, VARIANT_DIR, f'{stem}-{label}.{extension}')
+
+
+def _encode(image, image_format, options):
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _resized(image, width):
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def _placeholder(image):
+    small = _resized(image, PLACEHOLDER_WIDTH)
+    data = _encode(small, 'JPEG', {'quality': 40})
+    return 'data:image/jpeg;base64,' + base64.b64encode(data).decode('ascii')
+
+
+def generate_cover_variants(field_file):
+    """
+    Write resized copies of an ImageField file to its storage and return
+    the metadata to store on Post.cover_variants. Sizes wider than the
+    original are skipped, except that the smallest one is always produced.
+    """
+    storage = field_file.storage
+    with field_file.open('rb') as source:
+        image = Image.open(source)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    widths = sorted(VARIANT_WIDTHS.items(), key=lambda item: item[1])
+    variants = {}
+    for index, (label, width) in enumerate(widths):
+        if width > image.width and index > 0:
+            break
+        resized = _resized(image, min(width, image.width))
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            name = _variant_name(field_file.name, label, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            saved_name = storage.save(name, ContentFile(_encode(resized, image_format, options)))
+            variants.setdefault(extension, []).append({
+                'size': label,
+                'name': saved_name,
+                'width': resized.width,
+                'height': resized.height,
+            })
+
+    return {
+        'source': field_file.name,
+        'width': image.width,
+        'height': image.height,
+        'placeholder': _placeholder(image),
+        'formats': variants,
+    }
+
+
+def delete_cover_variants(storage, cover_variants):
+    for entries in (cover_variants or {}).get('formats', {}).values():
+        for entry in entries:
+            storage.delete(entry['name'])
+
+
+def cover_srcsets(storage, cover_variants):
+    """
+    {'webp': 'url 320w, url 640w', 'jpeg': ...} plus the largest JPEG as
+    the plain `src` fallback. Empty when no variants were generated.
+    """
+    formats = (cover_variants or {}).get('formats')
+    if not formats:
+        return {}
+    srcsets = {
+        extension: ', '.join(f"{storage.url(entry['name'])} {entry['width']}w" for entry in entries)
+        for extension, entries in formats.items()
+    }
+    jpeg = formats.get('jpeg') or next(iter(formats.values()))
+    return {
+        'srcset': srcsets,
+        'src': storage.url(jpeg[-1]['name']),
+        'width': cover_variants.get('width'),
+        'height': cover_variants.get('height'),
+        'placeholder': cover_variants.get('placeholder'),
+    }
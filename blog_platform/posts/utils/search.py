@@ -0,0 +1,130 @@
+"""
+Full-text search over posts backed by an inverted index in the database.
+
+Published posts are tokenized into SearchPosting rows (term, post,
+frequency). The index is maintained incrementally from the Post signals
+in posts.signals, and queries are ranked with BM25 inside a single
+grouped SQL statement over the postings of the query terms.
+"""
+import math
+import re
+from collections import Counter
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from .text import html_to_text
+
+TITLE_WEIGHT = 3
+MAX_TERM_LENGTH = 64
+BM25_K1 = 1.2
+BM25_B = 0.75
+STATS_CACHE_KEY = 'post_search_stats'
+STATS_CACHE_TIMEOUT = 5 * 60
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+STOP_WORDS = frozenset(
+    'a an and are as at be but by for from has have in is it its of on or '
+    'that the this to was were will with'.split()
+)
+
+
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def _term_frequencies(post):
+    frequencies = Counter(tokenize(html_to_text(post.content)))
+    for token in tokenize(post.title):
+        frequencies[token] += TITLE_WEIGHT
+    return frequencies
+
+
+@transaction.atomic
+def unindex_post(post_id):
+    from ..models import SearchDocument, SearchPosting, SearchTerm
+
+    term_ids = list(SearchPosting.objects.filter(post_id=post_id).values_list('term_id', flat=True))
+    if term_ids:
+        SearchTerm.objects.filter(id__in=term_ids).update(document_count=F('document_count') - 1)
+        SearchPosting.objects.filter(post_id=post_id).delete()
+    SearchDocument.objects.filter(post_id=post_id).delete()
+
+
+@transaction.atomic
+def index_post(post):
+    """(Re)index a post. Drafts are removed from the index."""
+    from ..models import SearchDocument, SearchPosting, SearchTerm
+
+    unindex_post(post.pk)
+    if post.is_draft:
+        return
+
+    frequencies = _term_frequencies(post)
+    length = sum(frequencies.values())
+    SearchDocument.objects.create(post_id=post.pk, length=length)
+    if not frequencies:
+        return
+
+    SearchTerm.objects.bulk_create(
+        [SearchTerm(term=term) for term in frequencies],
+        ignore_conflicts=True,
+    )
+    terms = dict(SearchTerm.objects.filter(term__in=frequencies).values_list('term', 'id'))
+    SearchTerm.objects.filter(id__in=terms.values()).update(document_count=F('document_count') + 1)
+    SearchPosting.objects.bulk_create([
+        SearchPosting(term_id=terms[term], post_id=post.pk, frequency=frequency, doc_length=length)
+        for term, frequency in frequencies.items()
+    ])
+
+
+def _corpus_stats():
+    from ..models import SearchDocument
+
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = SearchDocument.objects.aggregate(count=Count('pk'), average_length=Avg('length'))
+        stats = (stats['count'], float(stats['average_length'] or 0))
+        cache.set(STATS_CACHE_KEY, stats, STATS_CACHE_TIMEOUT)
+    return stats
+
+
+def ranked_post_ids(query, category_id=None):
+    """
+    Values queryset of {'post_id', 'score'} for posts matching any query
+    term, best BM25 score first. Slice it (or paginate it) to get a page.
+    """
+    from ..models import SearchPosting, SearchTerm
+
+    tokens = set(tokenize(query))
+    terms = list(SearchTerm.objects.filter(term__in=tokens, document_count__gt=0).values_list('id', 'document_count'))
+    if not terms:
+        return SearchPosting.objects.none().values('post_id')
+
+    total_documents, average_length = _corpus_stats()
+    average_length = average_length or 1.0
+    idf = Case(
+        *[
+            When(term_id=term_id, then=Value(math.log(1 + (total_documents - df + 0.5) / (df + 0.5))))
+            for term_id, df in terms
+        ],
+        output_field=FloatField(),
+    )
+    frequency = Cast('frequency', FloatField())
+    doc_length = Cast('doc_length', FloatField())
+    score = idf * frequency * Value(BM25_K1 + 1) / (
+        frequency + Value(BM25_K1) * (Value(1 - BM25_B) + Value(BM25_B) * doc_length / Value(average_length))
+    )
+
+    postings = SearchPosting.objects.filter(term_id__in=[term_id for term_id, _ in terms])
+    if category_id:
+        postings = postings.filter(post__category_id=category_id)
+    return (
+        postings.values('post_id')
+        .annotate(score=Sum(score, output_field=FloatField()))
+        .order_by('-score', '-post_id')
+    )
@@ -0,0 +1,8 @@
+from bs4 import BeautifulSoup
+
+
+def html_to_text(html):
+    """Plain text of an HTML fragment, with block boundaries kept as spaces."""
+    if not html:
+        return ''
+    return ' '.join(BeautifulSoup(html, 'html.parser').get_text(' ').split())
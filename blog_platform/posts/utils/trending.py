@@ -0,0 +1,121 @@
+"""
+Time-decayed trending scores.
+
+A post's trending score is sum(weight * 2 ** (-(now - t) / half_life)) over
+its views, likes and approved comments. Because every score decays at the
+same rate, ranking by sum(weight * 2 ** (t / half_life)) gives the same
+order at any moment and never needs rewriting as time passes. That sum is
+kept as log2 in PostTrendingScore.score to stay within float range, so it
+grows by roughly one per half-life and each event is a small update.
+"""
+import math
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+DEFAULTS = {
+    'HALF_LIFE_HOURS': 24,
+    'WEIGHTS': {'view': 1.0, 'like': 3.0, 'comment': 5.0},
+}
+
+
+def _config():
+    return {**DEFAULTS, **getattr(settings, 'TRENDING', {})}
+
+
+def _time_units(when):
+    return when.timestamp() / (_config()['HALF_LIFE_HOURS'] * 3600)
+
+
+def _log_add(log_a, log_b):
+    """log2(2 ** log_a + 2 ** log_b) without overflowing."""
+    high, low = max(log_a, log_b), min(log_a, log_b)
+    if high - low > 60:
+        return high
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def record_trending_events(events, when=None):
+    """
+    Add engagement to trending scores. `events` is an iterable of
+    (post_id, kind, count) with kind one of TRENDING['WEIGHTS'].
+    """
+    from ..models import PostTrendingScore
+    
+    weights = _config()['WEIGHTS']
+    when = when or timezone.now()
+    now = _time_units(when)
+    totals = defaultdict(float)
+    for post_id, kind, count in events:
+        totals[post_id] += weights[kind] * count
+    totals = {post_id: weight for post_id, weight in totals.items() if weight > 0}
+    if not totals:
+        return
+    
+    # A concurrent writer may create one of the missing rows first. The whole
+    # batch is then rolled back and retried, and those rows take the update path.
+    for attempt in range(3):
+        try:
+            with transaction.atomic():
+                rows = PostTrendingScore.objects.select_for_update().in_bulk(list(totals))
+                changed, created = [], []
+                for post_id, weight in totals.items():
+                    increment = now + math.log2(weight)
+                    row = rows.get(post_id)
+                    if row is None:
+                        created.append(PostTrendingScore(post_id=post_id, score=increment))
+                    else:
+                        row.score = _log_add(row.score, increment)
+                        # bulk_update() skips auto_now.
+                        row.updated_at = when
+                        changed.append(row)
+                if changed:
+                    PostTrendingScore.objects.bulk_update(changed, ['score', 'updated_at'])
+                if created:
+                    PostTrendingScore.objects.bulk_create(created)
+            return
+        except IntegrityError:
+            if attempt == 2:
+                raise
+            
+
+
+def record_trending_event(post_id, kind, count=1):
+    record_trending_events([(post_id, kind, count)])
+    
+    
+def rebuild_trending_scores(days=14):
+    """Recompute every score from the last `days` of views, likes and approved comments."""
+    from django.db.models import Count
+    from django.db.models.functions import TruncHour
+    from ..models import Comment, PostReaction, PostTrendingScore, PostView
+    
+    since = timezone.now() - timedelta(days=days)
+    sources = [
+        ('view', PostView.objects.filter(viewed_at__gte=since), 'viewed_at'),
+        ('like', PostReaction.objects.filter(created_at__gte=since), 'created_at'),
+        ('comment', Comment.objects.filter(is_approved=True, updated_at__gte=since), 'updated_at'),
+    ]
+    weights = _config()['WEIGHTS']
+    scores = {}
+    for kind, queryset, time_field in sources:
+        buckets = (
+            queryset.annotate(hour=TruncHour(time_field))
+            .values('post_id', 'hour')
+            .annotate(total=Count('id'))
+            .order_by()
+        )
+        for bucket in buckets.iterator():
+            increment = _time_units(bucket['hour']) + math.log2(weights[kind] * bucket['total'])
+            post_id = bucket['post_id']
+            scores[post_id] = _log_add(scores[post_id], increment) if post_id in scores else increment
+            
+    with transaction.atomic():
+        PostTrendingScore.objects.all().delete()
+        PostTrendingScore.objects.bulk_create(
+            [PostTrendingScore(post_id=post_id, score=score) for post_id, score in scores.items()],
+            batch_size=1000,
+        )
+    return len(scores)
@@ -0,0 +1,111 @@
+import gzip
+import json
+from datetime import timedelta
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+ARCHIVE_ROOT = 'post_view_archive'
+FIELDS = ('id', 'post_id', 'user_id', 'ip_address', 'viewed_at')
+
+
+def day_directory(day):
+    return f'{ARCHIVE_ROOT}/{day:%Y/%m/%d}'
+
+
+def archive_chunk(rows, storage=default_storage):
+    """
+    Write `rows` (dicts of FIELDS) as gzip JSONL, one append-only file per
+    day touched by the chunk. Returns the written file names.
+    """
+    by_day = {}
+    for row in rows:
+        by_day.setdefault(row['viewed_at'].date(), []).append(row)
+        
+    names = []
+    for day, day_rows in by_day.items():
+        lines = (
+            json.dumps({**row, 'viewed_at': row['viewed_at'].isoformat()}, separators=(',', ':'))
+            for row in day_rows
+        )
+        payload = gzip.compress('\n'.join(lines).encode('utf-8') + b'\n')
+        name = f"{day_directory(day)}/{day_rows[0]['id']}-{day_rows[-1]['id']}.jsonl.gz"
+        names.append(storage.save(name, ContentFile(payload)))
+    return names
+
+
+def archive_views_before(cutoff, chunk_size=5000, dry_run=False, storage=default_storage):
+    """
+    Move PostView rows older than `cutoff` to the archive in chunks, each
+    chunk written to storage before its rows are deleted in a short
+    transaction. Yields (archived_count, file_names) per chunk.
+    """
+    from ..models import PostView
+    
+    last = None
+    while True:
+        rows = PostView.objects.filter(viewed_at__lt=cutoff).order_by('viewed_at', 'id')
+        if last is not None:
+            # Dry runs delete nothing, so walk past the rows already seen.
+            rows = rows.filter(viewed_at__gte=last[0]).exclude(viewed_at=last[0], id__lte=last[1])
+        rows = list(rows.values(*FIELDS)[:chunk_size])
+        if not rows:
+            return
+        
+        if dry_run:
+            last = (rows[-1]['viewed_at'], rows[-1]['id'])
+            yield len(rows), []
+            continue
+        
+        names = archive_chunk(rows, storage=storage)
+        with transaction.atomic():
+            PostView.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        yield len(rows), names
+        
+
+def restore_views(start, end, batch_size=5000, storage=default_storage):
+    """
+    Re-insert archived PostView rows for the days start..end (inclusive).
+    Safe to run repeatedly: rows keep their ids and existing ones are skipped.
+    Returns the number of rows inserted.
+    """
+    from django.contrib.auth import get_user_model
+    from ..models import Post, PostView
+    
+    User = get_user_model()
+    restored = 0
+    day = start
+    while day <= end:
+        directory = day_directory(day)
+        day += timedelta(days=1)
+        # No exists() check: on S3 a directory is only a key prefix, never an object.
+        try:
+            _, files = storage.listdir(directory)
+        except FileNotFoundError:
+            continue
+        for file_name in sorted(files):
+            with storage.open(f'{directory}/{file_name}', 'rb') as fh:
+                rows = [json.loads(line) for line in gzip.decompress(fh.read()).splitlines() if line]
+            for offset in range(0, len(rows), batch_size):
+                restored += _restore_batch(rows[offset:offset + batch_size], Post, PostView, User)
+    return restored
+
+
+def _restore_batch(rows, Post, PostView, User):
+    post_ids = set(Post.objects.filter(id__in={row['post_id'] for row in rows}).values_list('id', flat=True))
+    user_ids = set(User.objects.filter(id__in={row['user_id'] for row in rows if row['user_id']}).values_list('id', flat=True))
+    existing = set(PostView.objects.filter(id__in=[row['id'] for row in rows]).values_list('id', flat=True))
+    views = [
+        PostView(
+            id=row['id'],
+            post_id=row['post_id'],
+            user_id=row['user_id'] if row['user_id'] in user_ids else None,
+            ip_address=row['ip_address'],
+            viewed_at=parse_datetime(row['viewed_at']),
+        )
+        for row in rows if row['post_id'] in post_ids and row['id'] not in existing
+    ]
+    # ignore_conflicts still covers rows restored concurrently since the check above.
+    PostView.objects.bulk_create(views, ignore_conflicts=True)
+    return len(views)
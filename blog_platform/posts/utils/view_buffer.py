@@ -0,0 +1,233 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, namedtuple
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from core.utils.site_stats import adjust_site_stats
+from .trending import record_trending_events
+
+logger = logging.getLogger('posts')
+
+ViewEvent = namedtuple('ViewEvent', ['post_id', 'user_id', 'ip_address', 'viewed_at'])
+
+DEFAULTS = {
+    'BACKEND': 'posts.utils.view_buffer.LocalViewBufferBackend',
+    'OPTIONS': {},
+    'FLUSH_INTERVAL': 5,
+    'FLUSH_SIZE': 500,
+}
+
+
+class LocalViewBufferBackend:
+    """In-process buffer. Each worker flushes its own events."""
+    
+    def __init__(self, max_events=100_000, **options):
+        self.max_events = max_events
+        self._events = []
+        self._lock = threading.Lock()
+        
+    def push(self, event):
+        with self._lock:
+            self._events.append(event)
+            return len(self._events)
+        
+    def drain(self, limit):
+        with self._lock:
+            events, self._events = self._events[:limit], self._events[limit:]
+            return events
+        
+    def requeue(self, events):
+        """Put events back in front; beyond max_events the oldest are dropped. Returns the number dropped."""
+        with self._lock:
+            self._events[:0] = events
+            dropped = max(0, len(self._events) - self.max_events)
+            del self._events[:dropped]
+            return dropped
+            
+    def __len__(self):
+        return len(self._events)
+    
+    
+class CacheViewBufferBackend:
+    """
+    Shared buffer on top of a Django cache alias (e.g. Redis), so events
+    from every worker land in one queue. Relies on atomic `incr`, which
+    the locmem backend also provides and can be used as a local stand-in.
+    """
+    
+    def __init__(self, alias='default', prefix='post_views', timeout=24 * 60 * 60, gap_timeout=60, max_events=100_000, **options):
+        self.cache = caches[alias]
+        self.prefix = prefix
+        self.timeout = timeout
+        self.max_events = max_events
+        # A slot still empty after this many seconds belongs to a push that died
+        # between claiming its position and writing it, and is skipped.
+        self.gap_timeout = gap_timeout
+        self._gap = None
+        self.cache.add(self._key('head'), 0, timeout=None)
+        self.cache.add(self._key('tail'), 0, timeout=None)
+        
+    def _key(self, name):
+        return f'{self.prefix}:{name}'
+    
+    def push(self, event):
+        position = self.cache.incr(self._key('tail'))
+        self.cache.set(self._key(position), tuple(event), timeout=self.timeout)
+        return position - self.cache.get(self._key('head'), 0)
+    
+    def drain(self, limit):
+        head = self.cache.get(self._key('head'), 0)
+        tail = self.cache.get(self._key('tail'), 0)
+        end = min(tail, head + limit)
+        if end <= head:
+            return []
+        keys = [self._key(position) for position in range(head + 1, end + 1)]
+        stored = self.cache.get_many(keys)
+        # A push increments `tail` before writing its slot. Stop at the first
+        # slot not written yet, it is picked up by a later drain.
+        count = 0
+        for position, key in enumerate(keys, head + 1):
+            if key in stored:
+                count += 1
+            elif self._gap_expired(position):
+                count += 1
+            else:
+                break
+        if not count:
+            return []
+        # Claim the range before consuming it so concurrent drains skip it.
+        if self.cache.incr(self._key('head'), count) != head + count:
+            self.cache.decr(self._key('head'), count)
+            return []
+        keys = keys[:count]
+        self.cache.delete_many(keys)
+        return [ViewEvent(*stored[key]) for key in keys if key in stored]
+    
+    def _gap_expired(self, position):
+        now = time.monotonic()
+        if self._gap is None or self._gap[0] != position:
+            self._gap = (position, now)
+            return False
+        return now - self._gap[1] >= self.gap_timeout
+    
+    def requeue(self, events):
+        """Push events back while the queue is below max_events, newest first kept. Returns the number dropped."""
+        room = max(0, self.max_events - len(self))
+        dropped = max(0, len(events) - room)
+        for event in events[dropped:]:
+            self.push(event)
+        return dropped
+            
+    def __len__(self):
+        return self.cache.get(self._key('tail'), 0) - self.cache.get(self._key('head'), 0)
+    
+
+class ViewBuffer:
+    """
+    Write-behind ingestion for post views.
+
+    `record()` only appends to the backend. Events are written either when
+    the buffer reaches FLUSH_SIZE or every FLUSH_INTERVAL seconds from a
+    background thread, as one bulk INSERT of PostView rows plus one
+    `view_count = view_count + n` UPDATE per post. Events that fail to
+    flush are put back, and the buffer is flushed on interpreter exit, so
+    delivery is at-least-once across graceful worker shutdown.
+    A FLUSH_INTERVAL of 0 writes every view synchronously.
+    """
+    
+    def __init__(self, backend, flush_interval, flush_size):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._timer_lock = threading.Lock()
+        
+    def record(self, post_id, user_id, ip_address):
+        size = self.backend.push(ViewEvent(post_id, user_id, ip_address, timezone.now()))
+        if not self.flush_interval or size >= self.flush_size:
+            self.flush()
+        else:
+            self._ensure_timer()
+            
+    def flush(self):
+        written = 0
+        with self._flush_lock:
+            while True:
+                events = self.backend.drain(self.flush_size)
+                if not events:
+                    return written
+                try:
+                    self._write(events)
+                except Exception:
+                    logger.exception('Failed to flush %s post views, requeueing', len(events))
+                    dropped = self.backend.requeue(events)
+                    if dropped:
+                        logger.warning('Post view buffer is full, dropped %s views', dropped)
+                    return written
+                written += len(events)
+                
+    def _write(self, events):
+        from django.contrib.auth import get_user_model
+        from ..models import Post, PostView
+        
+        # Posts or users may have been deleted since the views were recorded.
+        post_ids = {event.post_id for event in events}
+        existing = set(Post.objects.filter(id__in=post_ids).values_list('id', flat=True))
+        events = [event for event in events if event.post_id in existing]
+        if not events:
+            return
+        user_ids = {event.user_id for event in events if event.user_id}
+        users = set(get_user_model().objects.filter(id__in=user_ids).values_list('id', flat=True)) if user_ids else set()
+        
+        view_counts = Counter(event.post_id for event in events)
+        with transaction.atomic():
+            PostView.objects.bulk_create([
+                PostView(
+                    post_id=event.post_id,
+                    user_id=event.user_id if event.user_id in users else None,
+                    ip_address=event.ip_address,
+                    viewed_at=event.viewed_at,
+                )
+                for event in events
+            ])
+            for post_id, count in view_counts.items():
+                Post.objects.filter(pk=post_id).update(view_count=F('view_count') + count)
+            record_trending_events((post_id, 'view', count) for post_id, count in view_counts.items())
+        adjust_site_stats(total_views=len(events))
+                
+    def _ensure_timer(self):
+        with self._timer_lock:
+            if self._timer is None or not self._timer.is_alive():
+                self._timer = threading.Thread(target=self._run, name='post-view-flush', daemon=True)
+                self._timer.start()
+                
+    def _run(self):
+        event = threading.Event()
+        while not event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Post view flush loop failed')
+                
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_view_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                config = {**DEFAULTS, **getattr(settings, 'POST_VIEW_BUFFER', {})}
+                backend = import_string(config['BACKEND'])(**config['OPTIONS'])
+                _buffer = ViewBuffer(backend, config['FLUSH_INTERVAL'], config['FLUSH_SIZE'])
+                atexit.register(_buffer.flush)
+    return _buffer
@@ -0,0 +1,68 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+
+
+class ExpiringLRUSet:
+    """
+    Bounded set whose members expire `ttl` seconds after insertion.
+    When full, the least recently inserted member is evicted, so memory
+    stays at `max_entries` regardless of traffic.
+    """
+    
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def add(self, key):
+        """Insert `key`. Returns False if it was already present and unexpired."""
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at > now:
+                return False
+            self._entries.pop(key, None)
+            self._entries[key] = now + self.ttl
+            self._evict(now)
+            return True
+        
+    def _evict(self, now):
+        # Entries are kept in insertion order, which is also expiry order.
+        while self._entries:
+            key, expires_at = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            self._entries.popitem(last=False)
+            
+    def __len__(self):
+        return len(self._entries)
+    
+
+_seen = None
+_seen_lock = threading.Lock()
+
+
+def _get_seen():
+    global _seen
+    if _seen is None:
+        with _seen_lock:
+            if _seen is None:
+                _seen = ExpiringLRUSet(
+                    ttl=getattr(settings, 'POST_VIEW_DEDUPE_WINDOW', 30 * 60),
+                    max_entries=getattr(settings, 'POST_VIEW_DEDUPE_MAX_ENTRIES', 100_000),
+                )
+    return _seen
+
+
+def is_new_view(post_id, user_id=None, ip_address=None):
+    """
+    True the first time a viewer (user, or client IP for anonymous views)
+    opens a post within POST_VIEW_DEDUPE_WINDOW seconds, False for repeats.
+    """
+    if not getattr(settings, 'POST_VIEW_DEDUPE_WINDOW', 30 * 60):
+        return True
+    viewer = f'u{user_id}' if user_id is not None else f'ip{ip_address}'
+    return _get_seen().add((viewer, post_id))
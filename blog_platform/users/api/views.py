@@ -9,6 +9,7 @@ from core.utils.responses import success_response, error_response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.decorators import action
 from ..models import CustomUser
+from core.utils.site_stats import adjust_site_stats, user_stat_name
 
 class RegistrationAPIView(APIView):
 
@@ -16,7 +17,8 @@ class RegistrationAPIView(APIView):
         serializer = UserAuthSerializer(data = request.data)
         
         if serializer.is_valid():
-            serializer.save()
+            user = serializer.save()
+            adjust_site_stats(**{user_stat_name(user): 1})
             return success_response(
                 message='User registered succesfully.', 
                 status_code=status.HTTP_201_CREATED
@@ -70,6 +72,10 @@ class LogoutAPIView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
+        for cookie in ('refresh_token', 'access_token'):
+            token = request.COOKIES.get(cookie)
+            if token:
+                JWTHelper.revoke_token(token)
         response = success_response(message='Logged out successfully')
         JWTHelper.clear_auth_cookies(response)
         return response
@@ -88,6 +94,7 @@ class AdminUserManagementViewSet(ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
+        adjust_site_stats(**{user_stat_name(user): 1})
         
         display_serializer = AdminUserCreateSerializer(user)
         return success_response(data=display_serializer.data, status_code=status.HTTP_201_CREATED)
@@ -102,4 +109,5 @@ class AdminUserManagementViewSet(ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         user = self.get_object()
         user.delete()
+        adjust_site_stats(**{user_stat_name(user): -1})
         return success_response(message='User deleted successfully')
\ No newline at end of file
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.utils.token_revocation import get_revocation_store
+
+
+class Command(BaseCommand):
+    help = 'Delete revocation records of tokens that have expired and can no longer be used anyway.'
+    
+    def handle(self, *args, **options):
+        deleted = get_revocation_store().prune()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} expired token revocations.'))
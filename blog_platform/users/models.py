@@ -14,4 +14,17 @@ class CustomUser(AbstractUser, TimeStampedModel):
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
     
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+class RevokedToken(models.Model):
+    """
+    A JWT that must no longer be accepted, identified by its `jti` claim.
+    Rows are only needed until the token would have expired anyway; see
+    core.utils.token_revocation and `manage.py prune_revoked_tokens`.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.jti
@@ -1,3 +1,360 @@
-from django.test import TestCase
+import threading
+import time
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import UntypedToken
+from core.utils import token_revocation
+from core.utils.auth_context import ANONYMOUS, build_auth_context, get_auth_context
+from core.testing import IsolatedTestCase, login, make_user
+from core.utils.jwt_helper import JWTHelper
+from core.utils.refresh_coalescer import CacheRefreshBackend, LocalRefreshBackend, RefreshCoalescer
+from core.utils.token_cache import VerifiedTokenCache, get_token_cache
+from core.utils.token_revocation import BloomFilter, RevocationStore
+from core.utils.user_cache import UserCache
+from .models import RevokedToken
 
-# Create your tests here.
+User = get_user_model()
+
+
+class AuthTestCase(IsolatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = make_user('reader')
+
+
+class AuthContextTests(AuthTestCase):
+    url = '/api/posts/likes/'
+
+    def test_builds_the_context_from_a_valid_token(self):
+        token = str(JWTHelper.get_tokens_for_user(self.user).access_token)
+        context = build_auth_context(token)
+        self.assertTrue(context.is_authenticated)
+        self.assertEqual(context.token, token)
+        with self.assertNumQueries(1):
+            self.assertEqual(context.user, self.user)
+            self.assertEqual(context.user, self.user)
+
+    def test_missing_or_invalid_tokens_are_anonymous(self):
+        for token in (None, '', 'not-a-jwt'):
+            with self.subTest(token=token):
+                context = build_auth_context(token)
+                self.assertIs(context, ANONYMOUS)
+                self.assertIsNone(context.user)
+
+    def test_verifies_the_token_once_per_request(self):
+        login(self.client, self.user)
+        with mock.patch.object(JWTHelper, 'verify_token', wraps=JWTHelper.verify_token) as verify, \
+                mock.patch.object(JWTAuthentication, 'get_validated_token') as drf_verify:
+            response = self.client.get(self.url, {'ids': '1'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(verify.call_count, 1)
+        drf_verify.assert_not_called()
+
+    def test_bearer_tokens_without_cookies_take_the_regular_path(self):
+        token = JWTHelper.get_tokens_for_user(self.user).access_token
+        response = self.client.get(self.url, {'ids': '1'}, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 200)
+
+        request = RequestFactory().get(self.url, HTTP_AUTHORIZATION='Bearer not-a-jwt')
+        self.assertIs(get_auth_context(request), ANONYMOUS)
+        self.assertEqual(self.client.get(self.url, HTTP_AUTHORIZATION='Bearer not-a-jwt').status_code, 401)
+
+    def test_invalid_cookies_are_unauthenticated(self):
+        self.client.cookies['access_token'] = 'not-a-jwt'
+        self.assertEqual(self.client.get(self.url, {'ids': '1'}).status_code, 401)
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.cookies['access_token'].value, '')
+
+    def test_inactive_users_are_rejected(self):
+        login(self.client, self.user)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.url, {'ids': '1'}).status_code, 401)
+
+
+class UserCacheTests(AuthTestCase):
+    def test_serves_copies_until_the_user_changes(self):
+        user_cache = UserCache(ttl=60, max_entries=10)
+        loader = mock.Mock(side_effect=lambda user_id: User.objects.get(pk=user_id))
+        first = user_cache.get(self.user.pk, loader)
+        first.username = 'changed'
+        self.assertEqual(user_cache.get(self.user.pk, loader).username, 'reader')
+        self.assertEqual(loader.call_count, 1)
+
+        self.user.first_name = 'Ada'
+        self.user.save()
+        self.assertEqual(user_cache.get(self.user.pk, loader).first_name, 'Ada')
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(user_cache.stats()['hits'], 1)
+
+    def test_evicted_version_does_not_revive_stale_entries(self):
+        user_cache = UserCache(ttl=60, max_entries=10)
+        loader = mock.Mock(side_effect=lambda user_id: User.objects.get(pk=user_id))
+        user_cache.get(self.user.pk, loader)
+        User.objects.filter(pk=self.user.pk).update(first_name='Ada')
+        # The version key is evicted from the shared cache, not bumped.
+        cache.delete(f'cache_version:user:{self.user.pk}')
+        self.assertEqual(user_cache.get(self.user.pk, loader).first_name, 'Ada')
+        self.assertEqual(loader.call_count, 2)
+
+    def test_entries_expire_and_are_bounded(self):
+        user_cache = UserCache(ttl=60, max_entries=1)
+        loader = mock.Mock(side_effect=lambda user_id: User.objects.get(pk=user_id))
+        other = make_user('other')
+        user_cache.get(self.user.pk, loader)
+        user_cache.get(other.pk, loader)
+        self.assertEqual(user_cache.stats()['size'], 1)
+        user_cache.get(self.user.pk, loader)
+        self.assertEqual(loader.call_count, 3)
+
+        with mock.patch('core.utils.user_cache.time.monotonic', return_value=time.monotonic() + 61):
+            user_cache.get(self.user.pk, loader)
+        self.assertEqual(loader.call_count, 4)
+
+    def test_missing_users_and_disabled_cache(self):
+        self.assertIsNone(UserCache(ttl=60, max_entries=10).get(999999, JWTHelper._load_user))
+        disabled = UserCache(ttl=0, max_entries=10)
+        loader = mock.Mock(return_value=self.user)
+        disabled.get(self.user.pk, loader)
+        disabled.get(self.user.pk, loader)
+        self.assertEqual(loader.call_count, 2)
+        self.assertEqual(disabled.stats()['size'], 0)
+
+    def test_requests_reuse_the_cached_user(self):
+        login(self.client, self.user)
+        self.client.get('/api/posts/likes/', {'ids': '1'})
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get('/api/posts/likes/', {'ids': '1'}).status_code, 200)
+        self.assertFalse([query for query in queries if User._meta.db_table in query['sql']])
+
+    def test_deactivation_applies_to_the_next_request(self):
+        login(self.client, self.user)
+        self.assertEqual(self.client.get('/api/posts/likes/', {'ids': '1'}).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get('/api/posts/likes/', {'ids': '1'}).status_code, 401)
+
+    def test_stats_endpoint_is_admin_only(self):
+        login(self.client, self.user)
+        self.assertEqual(self.client.get('/api/admin-panel/auth-cache/').status_code, 403)
+        login(self.client, make_user('admin', is_staff=True, is_superuser=True))
+        response = self.client.get('/api/admin-panel/auth-cache/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()['data']['user_cache']), {'hits', 'misses', 'hit_rate', 'size', 'max_entries', 'ttl'})
+
+
+class VerifiedTokenCacheTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.token = str(JWTHelper.get_tokens_for_user(self.user).access_token)
+
+    def test_repeat_verifications_skip_the_signature_check(self):
+        with mock.patch('core.utils.jwt_helper.UntypedToken', wraps=UntypedToken) as decode:
+            first = JWTHelper.verify_token(self.token)
+            second = JWTHelper.verify_token(self.token)
+        self.assertEqual(first, second)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_invalid_tokens_are_not_cached(self):
+        self.assertIsNone(JWTHelper.verify_token(self.token[:-2]))
+        self.assertEqual(len(get_token_cache()), 0)
+
+    def test_entries_expire_with_the_token_and_are_bounded(self):
+        token_cache = VerifiedTokenCache(max_entries=1)
+        token_cache.put('expired', {'exp': time.time() - 1})
+        self.assertIsNone(token_cache.get('expired'))
+        token_cache.put('a', {'exp': time.time() + 60, 'user_id': 1})
+        token_cache.put('b', {'exp': time.time() + 60, 'user_id': 2})
+        self.assertIsNone(token_cache.get('a'))
+        self.assertEqual(token_cache.get('b')['user_id'], 2)
+        token_cache.put('no-exp', {'user_id': 3})
+        self.assertIsNone(token_cache.get('no-exp'))
+
+    def test_key_rotation_drops_cached_tokens(self):
+        JWTHelper.verify_token(self.token)
+        rotated = {**settings.SIMPLE_JWT, 'SIGNING_KEY': 'rotated-signing-key-0123456789abcdef'}
+        with override_settings(SIMPLE_JWT=rotated), \
+                mock.patch('core.utils.jwt_helper.UntypedToken', side_effect=TokenError('bad signature')):
+            self.assertIsNone(JWTHelper.verify_token(self.token))
+        self.assertEqual(len(get_token_cache()), 0)
+
+    def test_size_zero_disables_the_cache(self):
+        token_cache = VerifiedTokenCache(max_entries=0)
+        token_cache.put(self.token, {'exp': time.time() + 60})
+        self.assertIsNone(token_cache.get(self.token))
+        self.assertEqual(len(token_cache), 0)
+
+
+class TokenRevocationTests(AuthTestCase):
+    def _store(self, **options):
+        return RevocationStore(**{'sync_interval': 0, 'rebuild_interval': 3600, 'error_rate': 0.001, 'capacity': 100, **options})
+
+    def test_logout_revokes_both_tokens(self):
+        login(self.client, self.user)
+        access, refresh = self.client.cookies['access_token'].value, self.client.cookies['refresh_token'].value
+        self.assertEqual(self.client.post('/api/users/logout/').status_code, 200)
+        self.assertIsNone(JWTHelper.verify_token(access))
+        self.assertIsNone(JWTHelper.refresh_tokens(refresh))
+
+        self.client.cookies['access_token'] = access
+        self.client.cookies['refresh_token'] = refresh
+        self.assertEqual(self.client.get('/api/posts/likes/', {'ids': '1'}).status_code, 401)
+        self.assertEqual(
+            self.client.get('/api/posts/likes/', {'ids': '1'}, HTTP_AUTHORIZATION=f'Bearer {access}').status_code, 401
+        )
+
+    def test_rotation_revokes_the_old_refresh_token(self):
+        refresh = str(JWTHelper.get_tokens_for_user(self.user))
+        rotated = JWTHelper.refresh_tokens(refresh)
+        self.assertNotEqual(rotated['refresh'], refresh)
+        self.assertIsNone(JWTHelper.refresh_tokens(refresh))
+        self.assertIsNotNone(JWTHelper.refresh_tokens(rotated['refresh']))
+
+    def test_revoking_invalid_tokens_is_ignored(self):
+        JWTHelper.revoke_token('not-a-jwt')
+        self.assertFalse(RevokedToken.objects.exists())
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'jti-{i}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_filter_hits_are_confirmed_against_the_table(self):
+        store = self._store(sync_interval=3600)
+        store._sync().add('never-revoked')
+        with self.assertNumQueries(1):
+            self.assertFalse(store.is_revoked('never-revoked'))
+        with self.assertNumQueries(0):
+            self.assertFalse(store.is_revoked(''))
+
+    def test_other_processes_pick_up_revocations(self):
+        reader = self._store(sync_interval=3600)
+        self.assertFalse(reader.is_revoked('shared'))
+        self._store().revoke('shared', time.time() + 60)
+        self.assertFalse(reader.is_revoked('shared'))
+        reader.sync_interval = 0
+        self.assertTrue(reader.is_revoked('shared'))
+
+    def test_prune_command_drops_expired_revocations(self):
+        store = token_revocation.get_revocation_store()
+        store.revoke('expired', time.time() - 60)
+        store.revoke('live', time.time() + 60)
+        out = StringIO()
+        call_command('prune_revoked_tokens', stdout=out)
+        self.assertIn('Pruned 1 expired token revocations.', out.getvalue())
+        self.assertEqual(list(RevokedToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertTrue(store.is_revoked('live'))
+
+
+class RefreshCoalescerTests(AuthTestCase):
+    def setUp(self):
+        super().setUp()
+        self.refresh = str(JWTHelper.get_tokens_for_user(self.user))
+
+    def test_concurrent_refreshes_share_one_rotation(self):
+        coalescer = RefreshCoalescer(LocalRefreshBackend(), grace_period=30, wait_timeout=5)
+        started = threading.Event()
+        release = threading.Event()
+        pair = JWTHelper.refresh_tokens(self.refresh)
+
+        def slow_refresh(token):
+            started.set()
+            release.wait(5)
+            return pair
+
+        results = []
+        with mock.patch.object(JWTHelper, 'refresh_tokens', side_effect=slow_refresh) as refresh_tokens:
+            leader = threading.Thread(target=lambda: results.append(coalescer.refresh(self.refresh)))
+            leader.start()
+            started.wait(5)
+            followers = [threading.Thread(target=lambda: results.append(coalescer.refresh(self.refresh))) for _ in range(3)]
+            for thread in followers:
+                thread.start()
+            release.set()
+            for thread in [leader, *followers]:
+                thread.join(5)
+            # A straggler inside the grace period still gets the same pair.
+            results.append(coalescer.refresh(self.refresh))
+        self.assertEqual(refresh_tokens.call_count, 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result['refresh'] == pair['refresh'] for result in results))
+
+    def test_rotation_happens_once_for_real_tokens(self):
+        coalescer = RefreshCoalescer(LocalRefreshBackend(), grace_period=30, wait_timeout=5)
+        first = coalescer.refresh(self.refresh)
+        self.assertEqual(coalescer.refresh(self.refresh), first)
+        self.assertIsNone(JWTHelper.refresh_tokens(self.refresh))
+
+    def test_failed_leader_releases_the_claim(self):
+        coalescer = RefreshCoalescer(LocalRefreshBackend(), grace_period=30, wait_timeout=5)
+        with mock.patch.object(JWTHelper, 'refresh_tokens', side_effect=RuntimeError('database down')):
+            with self.assertRaises(RuntimeError):
+                coalescer.refresh(self.refresh)
+        self.assertIsNotNone(coalescer.refresh(self.refresh))
+
+    def test_expired_results_are_not_reused(self):
+        backend = LocalRefreshBackend()
+        backend.claim('key', 5)
+        backend.publish('key', {'refresh': 'old'}, grace_period=0)
+        self.assertTrue(backend.claim('key', 5))
+        self.assertEqual(backend.wait('missing', 0), (False, None))
+
+    def test_zero_grace_period_disables_coalescing(self):
+        coalescer = RefreshCoalescer(LocalRefreshBackend(), grace_period=0, wait_timeout=5)
+        self.assertIsNotNone(coalescer.refresh(self.refresh))
+        self.assertIsNone(coalescer.refresh(self.refresh))
+
+    def test_cache_backend_shares_results(self):
+        leader = CacheRefreshBackend(poll_interval=0.01)
+        follower = CacheRefreshBackend(poll_interval=0.01)
+        self.assertTrue(leader.claim('key', 5))
+        self.assertFalse(follower.claim('key', 5))
+        leader.publish('key', None, grace_period=30)
+        self.assertEqual(follower.wait('key', 1), (True, None))
+
+        self.assertTrue(leader.claim('other', 5))
+        leader.release('other')
+        self.assertEqual(follower.wait('other', 1), (False, None))
+
+    def test_middleware_refreshes_expired_sessions(self):
+        self.client.cookies['refresh_token'] = self.refresh
+        response = self.client.get('/api/posts/likes/', {'ids': '1'})
+        self.assertEqual(response.status_code, 200)
+        rotated = response.cookies['refresh_token'].value
+        self.assertNotEqual(rotated, self.refresh)
+
+        # A parallel request that still sent the old cookies.
+        self.client.cookies['access_token'] = ''
+        self.client.cookies['refresh_token'] = self.refresh
+        retry = self.client.get('/api/posts/likes/', {'ids': '1'})
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.cookies['refresh_token'].value, rotated)
+
+    def test_logout_revokes_the_pair_shared_in_the_grace_period(self):
+        self.client.cookies['refresh_token'] = self.refresh
+        response = self.client.get('/api/posts/likes/', {'ids': '1'})
+        access, rotated = response.cookies['access_token'].value, response.cookies['refresh_token'].value
+
+        self.client.cookies['access_token'] = access
+        self.client.cookies['refresh_token'] = rotated
+        self.assertEqual(self.client.post('/api/users/logout/').status_code, 200)
+
+        # Replaying the old refresh token must not hand out the revoked pair.
+        self.client.cookies['access_token'] = ''
+        self.client.cookies['refresh_token'] = self.refresh
+        retry = self.client.get('/api/posts/likes/', {'ids': '1'})
+        self.assertEqual(retry.status_code, 401)
+        self.assertNotIn('refresh_token', retry.cookies)